@@ -0,0 +1,49 @@
+"""
+Shared catalog reflection for migration scripts.
+
+Column-existence checks go through one SQLAlchemy Inspector per Alembic run. The
+Inspector memoizes each reflection call (has_table, get_columns) on its instance, so
+later revisions in the same run reuse the cached results instead of re-querying the
+catalog, and the lookups stay dialect-specific rather than hand-written Postgres SQL.
+Call invalidate() after DDL that adds, drops or renames columns so later revisions see
+the new layout.
+"""
+
+import weakref
+
+import sqlalchemy as sa
+from alembic import context, op
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy.engine.reflection import Inspector
+
+# Inspectors keyed by the run's MigrationContext: an entry (and the connection its
+# Inspector references) goes away with the context instead of outliving the upgrade
+_inspectors: "weakref.WeakKeyDictionary[MigrationContext, Inspector]" = weakref.WeakKeyDictionary()
+
+
+def _inspector(bind) -> Inspector:
+    """Return the Inspector for the migration connection, cached for the current run."""
+    migration_context = op.get_context()
+    inspector = _inspectors.get(migration_context)
+    if inspector is None or inspector.bind is not bind:
+        inspector = _inspectors[migration_context] = sa.inspect(bind)
+    return inspector
+
+
+def _target_schema() -> str | None:
+    """Get the tenant schema being migrated, or None for the default schema."""
+    return context.config.get_main_option("target_schema") or None
+
+
+def has_column(bind, table_name: str, column_name: str) -> bool:
+    """Check whether a table in the target schema has the given column."""
+    inspector = _inspector(bind)
+    schema = _target_schema()
+    if not inspector.has_table(table_name, schema=schema):
+        return False
+    return any(column["name"] == column_name for column in inspector.get_columns(table_name, schema=schema))
+
+
+def invalidate() -> None:
+    """Drop cached reflection after DDL that changes columns (the next lookup re-inspects)."""
+    _inspectors.pop(op.get_context(), None)
@@ -144,6 +144,10 @@ def run_migrations_online() -> None:
         connection.commit()  # Commit the SET command
 
         # Configure context with version_table_schema if using a specific schema
+        # Pending revisions share Alembic's default outer transaction (transaction_per_migration
+        # is False), except where a revision commits mid-way through autocommit_block() for a
+        # batched rewrite. Published revisions are never merged, so databases stamped at any
+        # of them can still upgrade.
         context_opts = {
             "connection": connection,
             "target_metadata": target_metadata,
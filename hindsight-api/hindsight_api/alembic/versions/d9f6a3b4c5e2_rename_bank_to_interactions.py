@@ -4,16 +4,71 @@ Revision ID: d9f6a3b4c5e2
 Revises: c8e5f2a3b4d1
 Create Date: 2024-12-04 15:00:00.000000
 
+fact_type is a TEXT column guarded by a CHECK constraint, so the rename is a row
+rewrite (batched below) plus a constraint swap. Converting it to a Postgres ENUM
+(which would make future renames catalog-only via ALTER TYPE ... RENAME VALUE) is
+deliberately not done here: the conversion itself rewrites the whole table and has
+to rebuild every fact_type index and the memory_units_bm25 materialized view, which
+costs more than this one-off rename.
 """
 
+import logging
+import os
+import time
+
+import sqlalchemy as sa
 from alembic import context, op
 
+from hindsight_api.config import DEFAULT_MIGRATION_ASYNC_COMMIT, ENV_MIGRATION_ASYNC_COMMIT
+
+logger = logging.getLogger(__name__)
+
 # revision identifiers, used by Alembic.
 revision = "d9f6a3b4c5e2"
 down_revision = "c8e5f2a3b4d1"
 branch_labels = None
 depends_on = None
 
+# Rows rewritten per UPDATE statement. Each batch commits on its own so row locks
+# and WAL volume stay bounded on large memory_units tables.
+BATCH_SIZE = 10000
+# When most of the table matches, the rewrite touches nearly every page anyway, so use
+# fewer, larger batches to cut per-batch commit overhead. A CTAS + table swap would be
+# faster still, but would drop the foreign keys in both directions and the dependent
+# memory_units_bm25 materialized view.
+HIGH_MATCH_RATIO = 0.3
+HIGH_MATCH_BATCH_SIZE = 50000
+
+# Opt-in (HINDSIGHT_API_MIGRATION_ASYNC_COMMIT=true) for maintenance windows: the per-batch
+# commits of the rewrite don't wait for their WAL flush. A crash mid-migration can lose
+# the last few committed batches (the rerun redoes them); it never corrupts data, and
+# replicas still receive everything. SET UNLOGGED is not an option here: memory_units
+# has foreign keys to and from logged tables, which Postgres rejects for unlogged ones.
+ASYNC_COMMIT = os.getenv(ENV_MIGRATION_ASYNC_COMMIT, str(DEFAULT_MIGRATION_ASYNC_COMMIT)).lower() == "true"
+
+# The constraint swap needs AccessExclusiveLock. While it waits for one (e.g. behind a
+# long-running transaction), every other query on memory_units queues behind it, so
+# give up quickly and retry with backoff instead of stalling production traffic.
+LOCK_TIMEOUT = "3s"
+LOCK_RETRIES = 10
+LOCK_RETRY_INITIAL_BACKOFF = 0.5
+LOCK_RETRY_MAX_BACKOFF = 30.0
+# Upper bound for any single statement of this migration (batches, sweep, VALIDATE)
+STATEMENT_TIMEOUT = "10min"
+# SQLSTATE for lock_not_available (raised when lock_timeout expires)
+LOCK_NOT_AVAILABLE = "55P03"
+
+# fact_type check expressions after upgrade / after downgrade. The swap is issued as a
+# plain DDL string (built once below apart from the schema prefix), so no constraint
+# object is compiled per run.
+EXPERIENCE_FACT_TYPE_CHECK = "fact_type IN ('world', 'experience', 'opinion', 'observation')"
+BANK_FACT_TYPE_CHECK = "fact_type IN ('world', 'bank', 'opinion', 'observation')"
+_REPLACE_FACT_TYPE_CHECK_SQL = (
+    "ALTER TABLE {schema}memory_units "
+    "DROP CONSTRAINT IF EXISTS memory_units_fact_type_check, "
+    "ADD CONSTRAINT memory_units_fact_type_check CHECK ({expression}) NOT VALID"
+)
+
 
 def _get_schema_prefix() -> str:
     """Get schema prefix for table names (e.g., 'tenant_x.' or '' for public)."""
@@ -21,33 +76,229 @@ def _get_schema_prefix() -> str:
     return f'"{schema}".' if schema else ""
 
 
+def _fact_type_check_allows(schema: str, value: str) -> bool:
+    """
+    Check whether the current memory_units_fact_type_check constraint accepts a value.
+
+    A constraint left NOT VALID by an interrupted run counts as missing so it gets rebuilt.
+    """
+    conn = op.get_bind()
+    definition = conn.execute(
+        sa.text("""
+        SELECT pg_get_constraintdef(oid)
+        FROM pg_constraint
+        WHERE conrelid = to_regclass(:table_name) AND conname = 'memory_units_fact_type_check' AND convalidated
+    """),
+        {"table_name": f"{schema}memory_units"},
+    ).scalar()
+    return definition is not None and f"'{value}'" in definition
+
+
+def _estimate_match_ratio(value: str) -> float:
+    """
+    Estimate the fraction of memory_units rows with the given fact_type.
+
+    Reads the planner statistics instead of counting; returns 0.0 when the table has
+    never been analyzed or the value is not among the most common ones.
+    """
+    conn = op.get_bind()
+    row = conn.execute(
+        sa.text("""
+        SELECT most_common_vals::text::text[], most_common_freqs
+        FROM pg_stats
+        WHERE schemaname = COALESCE(:schema, current_schema())
+          AND tablename = 'memory_units' AND attname = 'fact_type'
+    """),
+        {"schema": context.config.get_main_option("target_schema") or None},
+    ).first()
+    if not row or not row[0]:
+        return 0.0
+    values, freqs = row
+    return freqs[values.index(value)] if value in values else 0.0
+
+
+def _rename_fact_type(schema: str, old_value: str, new_value: str) -> int:
+    """Rewrite fact_type from old_value to new_value in ctid-bounded batches; return the row count."""
+    conn = op.get_bind()
+
+    # Fresh databases have nothing to rewrite; skip the batch loop (and leaving the
+    # migration transaction for autocommit) entirely
+    has_rows = conn.execute(
+        sa.text(f"SELECT 1 FROM {schema}memory_units WHERE fact_type = :old_value LIMIT 1"),
+        {"old_value": old_value},
+    ).first()
+    if not has_rows:
+        return 0
+
+    # No transient index is needed here: idx_memory_units_fact_type (initial schema)
+    # already covers the fact_type predicate, so each batch select is an index scan
+    # over the matching rows only. Building a partial index would cost an extra
+    # full-table scan before the first batch runs.
+
+    batch_size = HIGH_MATCH_BATCH_SIZE if _estimate_match_ratio(old_value) > HIGH_MATCH_RATIO else BATCH_SIZE
+
+    # Autocommit so every batch is its own transaction instead of one giant UPDATE.
+    # SKIP LOCKED keeps batches from queueing behind concurrent writers; a short batch
+    # means the unlocked matches are exhausted.
+    total_updated = 0
+    with op.get_context().autocommit_block():
+        if ASYNC_COMMIT:
+            conn.execute(sa.text("SET synchronous_commit = off"))
+
+        while True:
+            result = conn.execute(
+                sa.text(f"""
+                WITH batch AS (
+                    SELECT ctid FROM {schema}memory_units
+                    WHERE fact_type = :old_value
+                    LIMIT :batch_size
+                    FOR UPDATE SKIP LOCKED
+                )
+                UPDATE {schema}memory_units m
+                SET fact_type = :new_value
+                FROM batch
+                WHERE m.ctid = batch.ctid
+                RETURNING 1
+            """),
+                {"old_value": old_value, "new_value": new_value, "batch_size": batch_size},
+            )
+            updated = result.rowcount
+            total_updated += updated
+            logger.info(f"Rewrote {updated} memory_units rows from fact_type '{old_value}' to '{new_value}'")
+            if updated < batch_size:
+                break
+
+        # Final blocking sweep for any rows that were locked (and therefore skipped) above
+        result = conn.execute(
+            sa.text(f"UPDATE {schema}memory_units SET fact_type = :new_value WHERE fact_type = :old_value"),
+            {"old_value": old_value, "new_value": new_value},
+        )
+        total_updated += result.rowcount
+
+        if ASYNC_COMMIT:
+            conn.execute(sa.text("RESET synchronous_commit"))
+
+    return total_updated
+
+
+def _execute_with_lock_retry(statement: str) -> None:
+    """
+    Run a DDL statement under LOCK_TIMEOUT, retrying with exponential backoff.
+
+    Each attempt runs in a savepoint so a lock timeout only rolls back that attempt,
+    not the surrounding migration transaction.
+    """
+    conn = op.get_bind()
+    backoff = LOCK_RETRY_INITIAL_BACKOFF
+
+    conn.execute(sa.text(f"SET lock_timeout = '{LOCK_TIMEOUT}'"))
+    try:
+        for attempt in range(1, LOCK_RETRIES + 1):
+            savepoint = conn.begin_nested()
+            try:
+                conn.execute(sa.text(statement))
+            except sa.exc.OperationalError as e:
+                savepoint.rollback()
+                if getattr(e.orig, "pgcode", None) != LOCK_NOT_AVAILABLE or attempt == LOCK_RETRIES:
+                    raise
+                logger.warning(
+                    f"Lock timeout on memory_units (attempt {attempt}/{LOCK_RETRIES}), retrying in {backoff:.1f}s"
+                )
+                time.sleep(backoff)
+                backoff = min(backoff * 2, LOCK_RETRY_MAX_BACKOFF)
+            else:
+                savepoint.commit()
+                return
+    finally:
+        conn.execute(sa.text("RESET lock_timeout"))
+
+
+def _replace_fact_type_check(schema: str, expression: str) -> None:
+    """
+    Swap memory_units_fact_type_check for a NOT VALID one with the given expression.
+
+    Drop and add go in one multi-action ALTER TABLE: one round-trip and one
+    AccessExclusiveLock acquisition instead of two. IF EXISTS keeps it a no-op drop
+    when a previous (partial) run already removed the old constraint. The result is
+    metadata-only: new writes are checked immediately, while existing rows are left
+    for _validate_fact_type_check().
+    """
+    _execute_with_lock_retry(_REPLACE_FACT_TYPE_CHECK_SQL.format(schema=schema, expression=expression))
+
+
+def _validate_fact_type_check(schema: str) -> None:
+    """
+    Validate memory_units_fact_type_check against existing rows.
+
+    Runs in its own transaction so the AccessExclusiveLock taken by the ADD is already
+    released; VALIDATE CONSTRAINT only needs ShareUpdateExclusiveLock and lets concurrent
+    reads/writes continue during the scan.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(f"ALTER TABLE {schema}memory_units VALIDATE CONSTRAINT memory_units_fact_type_check")
+
+
+def _vacuum_memory_units(schema: str) -> None:
+    """
+    VACUUM (ANALYZE) memory_units after a rewrite.
+
+    Every rewritten row leaves a dead tuple behind; reclaiming them (and refreshing the
+    fact_type statistics) right away keeps later migrations and post-deploy queries from
+    scanning the bloat until autovacuum catches up. VACUUM cannot run inside a
+    transaction block, hence the autocommit block.
+    """
+    with op.get_context().autocommit_block():
+        op.execute(f"VACUUM (ANALYZE) {schema}memory_units")
+
+
 def upgrade():
     schema = _get_schema_prefix()
+    op.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
 
-    # Drop old check constraint FIRST (before updating data)
-    op.drop_constraint("memory_units_fact_type_check", "memory_units", type_="check")
+    # Skip the constraint rewrite if a previous run already installed the new one
+    constraint_migrated = _fact_type_check_allows(schema, "experience") and not _fact_type_check_allows(
+        schema, "bank"
+    )
+
+    # Swap the check constraint BEFORE updating data: the old one rejects 'experience'.
+    # The new one is added NOT VALID so the swap is instant and only the rewritten rows
+    # are checked as they are updated; existing rows are validated once at the end.
+    if not constraint_migrated:
+        _replace_fact_type_check(schema, EXPERIENCE_FACT_TYPE_CHECK)
 
     # Update existing 'bank' values to 'experience'
-    op.execute(f"UPDATE {schema}memory_units SET fact_type = 'experience' WHERE fact_type = 'bank'")
+    updated = _rename_fact_type(schema, "bank", "experience")
     # Also update any 'interactions' values (in case of partial migration)
-    op.execute(f"UPDATE {schema}memory_units SET fact_type = 'experience' WHERE fact_type = 'interactions'")
+    updated += _rename_fact_type(schema, "interactions", "experience")
 
-    # Create new check constraint with 'experience' instead of 'bank'
-    op.create_check_constraint(
-        "memory_units_fact_type_check", "memory_units", "fact_type IN ('world', 'experience', 'opinion', 'observation')"
-    )
+    if not constraint_migrated:
+        _validate_fact_type_check(schema)
+
+    # VACUUM time scales with table size, so it runs outside the statement_timeout
+    op.execute("RESET statement_timeout")
+    if updated:
+        _vacuum_memory_units(schema)
 
 
 def downgrade():
     schema = _get_schema_prefix()
+    op.execute(f"SET statement_timeout = '{STATEMENT_TIMEOUT}'")
+
+    # Skip the constraint rewrite if the old one is already in place
+    constraint_reverted = _fact_type_check_allows(schema, "bank") and not _fact_type_check_allows(
+        schema, "experience"
+    )
 
-    # Drop new check constraint FIRST
-    op.drop_constraint("memory_units_fact_type_check", "memory_units", type_="check")
+    # Swap back to the old check constraint (NOT VALID) before updating data
+    if not constraint_reverted:
+        _replace_fact_type_check(schema, BANK_FACT_TYPE_CHECK)
 
     # Update 'experience' back to 'bank'
-    op.execute(f"UPDATE {schema}memory_units SET fact_type = 'bank' WHERE fact_type = 'experience'")
+    updated = _rename_fact_type(schema, "experience", "bank")
 
-    # Recreate old check constraint
-    op.create_check_constraint(
-        "memory_units_fact_type_check", "memory_units", "fact_type IN ('world', 'bank', 'opinion', 'observation')"
-    )
+    if not constraint_reverted:
+        _validate_fact_type_check(schema)
+
+    op.execute("RESET statement_timeout")
+    if updated:
+        _vacuum_memory_units(schema)
@@ -14,6 +14,8 @@ from collections.abc import Sequence
 import sqlalchemy as sa
 from alembic import context, op
 
+from hindsight_api.alembic import _reflect
+
 # revision identifiers, used by Alembic.
 revision: str = "e0a1b2c3d4e5"
 down_revision: str | Sequence[str] | None = "rename_personality"
@@ -27,28 +29,13 @@ def _get_schema_prefix() -> str:
     return f'"{schema}".' if schema else ""
 
 
-def _get_target_schema() -> str:
-    """Get the target schema name (tenant schema or 'public')."""
-    schema = context.config.get_main_option("target_schema")
-    return schema if schema else "public"
-
-
 def upgrade() -> None:
     """Convert Big Five disposition to 3-trait disposition."""
     conn = op.get_bind()
     schema = _get_schema_prefix()
-    target_schema = _get_target_schema()
 
     # Check if disposition column exists (should have been created by previous migration)
-    result = conn.execute(
-        sa.text("""
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = :schema AND table_name = 'banks' AND column_name = 'disposition'
-    """),
-        {"schema": target_schema},
-    )
-    if not result.fetchone():
+    if not _reflect.has_column(conn, "banks", "disposition"):
         # Column doesn't exist yet (shouldn't happen but be safe)
         return
 
@@ -79,18 +66,9 @@ def downgrade() -> None:
     """Convert back to Big Five disposition."""
     conn = op.get_bind()
     schema = _get_schema_prefix()
-    target_schema = _get_target_schema()
 
     # Check if disposition column exists
-    result = conn.execute(
-        sa.text("""
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = :schema AND table_name = 'banks' AND column_name = 'disposition'
-    """),
-        {"schema": target_schema},
-    )
-    if not result.fetchone():
+    if not _reflect.has_column(conn, "banks", "disposition"):
         return
 
     # Revert to Big Five format with default values
@@ -12,6 +12,8 @@ import sqlalchemy as sa
 from alembic import context, op
 from sqlalchemy.dialects import postgresql
 
+from hindsight_api.alembic import _reflect
+
 # revision identifiers, used by Alembic.
 revision: str = "rename_personality"
 down_revision: str | Sequence[str] | None = "d9f6a3b4c5e2"
@@ -19,42 +21,25 @@ branch_labels: str | Sequence[str] | None = None
 depends_on: str | Sequence[str] | None = None
 
 
-def _get_target_schema() -> str:
-    """Get the target schema name (tenant schema or 'public')."""
+def _get_schema_prefix() -> str:
+    """Get schema prefix for table names (e.g., 'tenant_x.' or '' for public)."""
     schema = context.config.get_main_option("target_schema")
-    return schema if schema else "public"
+    return f'"{schema}".' if schema else ""
 
 
 def upgrade() -> None:
     """Rename personality column to disposition in banks table (if it exists)."""
     conn = op.get_bind()
-    target_schema = _get_target_schema()
-
-    # Check if 'personality' column exists (old database)
-    result = conn.execute(
-        sa.text("""
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = :schema AND table_name = 'banks' AND column_name = 'personality'
-    """),
-        {"schema": target_schema},
-    )
-    has_personality = result.fetchone() is not None
+    schema = _get_schema_prefix()
 
-    # Check if 'disposition' column exists (new database)
-    result = conn.execute(
-        sa.text("""
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = :schema AND table_name = 'banks' AND column_name = 'disposition'
-    """),
-        {"schema": target_schema},
-    )
-    has_disposition = result.fetchone() is not None
+    # Column lookups come from the shared per-run catalog reflection
+    has_personality = _reflect.has_column(conn, "banks", "personality")
+    has_disposition = _reflect.has_column(conn, "banks", "disposition")
 
     if has_personality and not has_disposition:
-        # Old database: rename personality -> disposition
-        op.alter_column("banks", "personality", new_column_name="disposition")
+        # Old database: rename personality -> disposition (plain catalog rename, no reflection)
+        op.execute(f"ALTER TABLE {schema}banks RENAME COLUMN personality TO disposition")
+        _reflect.invalidate()
     elif not has_personality and not has_disposition:
         # Neither exists (shouldn't happen, but be safe): add disposition column
         op.add_column(
@@ -66,20 +51,14 @@ def upgrade() -> None:
                 nullable=False,
             ),
         )
+        _reflect.invalidate()
     # else: disposition already exists, nothing to do
 
 
 def downgrade() -> None:
     """Revert disposition column back to personality."""
     conn = op.get_bind()
-    target_schema = _get_target_schema()
-    result = conn.execute(
-        sa.text("""
-        SELECT column_name
-        FROM information_schema.columns
-        WHERE table_schema = :schema AND table_name = 'banks' AND column_name = 'disposition'
-    """),
-        {"schema": target_schema},
-    )
-    if result.fetchone():
-        op.alter_column("banks", "disposition", new_column_name="personality")
+    schema = _get_schema_prefix()
+    if _reflect.has_column(conn, "banks", "disposition"):
+        op.execute(f"ALTER TABLE {schema}banks RENAME COLUMN disposition TO personality")
+        _reflect.invalidate()
@@ -18,6 +18,7 @@ ENV_LLM_MODEL = "HINDSIGHT_API_LLM_MODEL"
 ENV_LLM_BASE_URL = "HINDSIGHT_API_LLM_BASE_URL"
 ENV_LLM_MAX_CONCURRENT = "HINDSIGHT_API_LLM_MAX_CONCURRENT"
 ENV_LLM_TIMEOUT = "HINDSIGHT_API_LLM_TIMEOUT"
+ENV_LLM_MAX_TOKENS_PER_MINUTE = "HINDSIGHT_API_LLM_MAX_TOKENS_PER_MINUTE"
 ENV_LLM_GROQ_SERVICE_TIER = "HINDSIGHT_API_LLM_GROQ_SERVICE_TIER"
 
 ENV_EMBEDDINGS_PROVIDER = "HINDSIGHT_API_EMBEDDINGS_PROVIDER"
@@ -45,6 +46,8 @@ ENV_OBSERVATION_TOP_ENTITIES = "HINDSIGHT_API_OBSERVATION_TOP_ENTITIES"
 # Optimization flags
 ENV_SKIP_LLM_VERIFICATION = "HINDSIGHT_API_SKIP_LLM_VERIFICATION"
 ENV_LAZY_RERANKER = "HINDSIGHT_API_LAZY_RERANKER"
+ENV_FACT_EXTRACTION_CACHE_SIZE = "HINDSIGHT_API_FACT_EXTRACTION_CACHE_SIZE"
+ENV_MIGRATION_ASYNC_COMMIT = "HINDSIGHT_API_MIGRATION_ASYNC_COMMIT"
 
 # Default values
 DEFAULT_DATABASE_URL = "pg0"
@@ -52,6 +55,7 @@ DEFAULT_LLM_PROVIDER = "openai"
 DEFAULT_LLM_MODEL = "gpt-5-mini"
 DEFAULT_LLM_MAX_CONCURRENT = 32
 DEFAULT_LLM_TIMEOUT = 120.0  # seconds
+DEFAULT_LLM_MAX_TOKENS_PER_MINUTE = 0  # Estimated prompt tokens per minute (0 = unlimited)
 
 DEFAULT_EMBEDDINGS_PROVIDER = "local"
 DEFAULT_EMBEDDINGS_LOCAL_MODEL = "BAAI/bge-small-en-v1.5"
@@ -72,6 +76,10 @@ DEFAULT_MCP_LOCAL_BANK_ID = "mcp"
 DEFAULT_OBSERVATION_MIN_FACTS = 5  # Min facts required to generate entity observations
 DEFAULT_OBSERVATION_TOP_ENTITIES = 5  # Max entities to process per retain batch
 
+# Optimization defaults
+DEFAULT_FACT_EXTRACTION_CACHE_SIZE = 1024  # Cached LLM extraction responses (0 disables)
+DEFAULT_MIGRATION_ASYNC_COMMIT = False  # Batched migration rewrites skip the per-commit WAL flush
+
 # Default MCP tool descriptions (can be customized via env vars)
 DEFAULT_MCP_RETAIN_DESCRIPTION = """Store important information to long-term memory.
 
@@ -110,6 +118,7 @@ class HindsightConfig:
     llm_base_url: str | None
     llm_max_concurrent: int
     llm_timeout: float
+    llm_max_tokens_per_minute: int
 
     # Embeddings
     embeddings_provider: str
@@ -137,6 +146,8 @@ class HindsightConfig:
     # Optimization flags
     skip_llm_verification: bool
     lazy_reranker: bool
+    fact_extraction_cache_size: int
+    migration_async_commit: bool
 
     @classmethod
     def from_env(cls) -> "HindsightConfig":
@@ -151,6 +162,9 @@ class HindsightConfig:
             llm_base_url=os.getenv(ENV_LLM_BASE_URL) or None,
             llm_max_concurrent=int(os.getenv(ENV_LLM_MAX_CONCURRENT, str(DEFAULT_LLM_MAX_CONCURRENT))),
             llm_timeout=float(os.getenv(ENV_LLM_TIMEOUT, str(DEFAULT_LLM_TIMEOUT))),
+            llm_max_tokens_per_minute=int(
+                os.getenv(ENV_LLM_MAX_TOKENS_PER_MINUTE, str(DEFAULT_LLM_MAX_TOKENS_PER_MINUTE))
+            ),
             # Embeddings
             embeddings_provider=os.getenv(ENV_EMBEDDINGS_PROVIDER, DEFAULT_EMBEDDINGS_PROVIDER),
             embeddings_local_model=os.getenv(ENV_EMBEDDINGS_LOCAL_MODEL, DEFAULT_EMBEDDINGS_LOCAL_MODEL),
@@ -169,6 +183,12 @@ class HindsightConfig:
             # Optimization flags
             skip_llm_verification=os.getenv(ENV_SKIP_LLM_VERIFICATION, "false").lower() == "true",
             lazy_reranker=os.getenv(ENV_LAZY_RERANKER, "false").lower() == "true",
+            fact_extraction_cache_size=int(
+                os.getenv(ENV_FACT_EXTRACTION_CACHE_SIZE, str(DEFAULT_FACT_EXTRACTION_CACHE_SIZE))
+            ),
+            migration_async_commit=(
+                os.getenv(ENV_MIGRATION_ASYNC_COMMIT, str(DEFAULT_MIGRATION_ASYNC_COMMIT)).lower() == "true"
+            ),
             # Observation thresholds
             observation_min_facts=int(os.getenv(ENV_OBSERVATION_MIN_FACTS, str(DEFAULT_OBSERVATION_MIN_FACTS))),
             observation_top_entities=int(
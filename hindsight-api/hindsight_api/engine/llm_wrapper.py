@@ -3,24 +3,29 @@ LLM wrapper for unified configuration across providers.
 """
 
 import asyncio
+import functools
 import json
 import logging
 import os
 import re
 import time
+from collections.abc import AsyncIterator
 from typing import Any
 
 import httpx
 from google import genai
 from google.genai import errors as genai_errors
 from google.genai import types as genai_types
-from openai import APIConnectionError, APIStatusError, AsyncOpenAI, LengthFinishReasonError
+from openai import APIConnectionError, APIStatusError, APITimeoutError, AsyncOpenAI, LengthFinishReasonError
+from pydantic import ValidationError
 
 from ..config import (
     DEFAULT_LLM_MAX_CONCURRENT,
+    DEFAULT_LLM_MAX_TOKENS_PER_MINUTE,
     DEFAULT_LLM_TIMEOUT,
     ENV_LLM_GROQ_SERVICE_TIER,
     ENV_LLM_MAX_CONCURRENT,
+    ENV_LLM_MAX_TOKENS_PER_MINUTE,
     ENV_LLM_TIMEOUT,
 )
 
@@ -32,12 +37,91 @@ logger = logging.getLogger(__name__)
 # Disable httpx logging
 logging.getLogger("httpx").setLevel(logging.WARNING)
 
+
+@functools.cache
+def _get_json_schema(response_format: Any) -> dict[str, Any] | None:
+    """
+    Get (and memoize) the JSON schema of a response_format model.
+
+    Pydantic regenerates model_json_schema() on every call; response models are fixed
+    classes, so each one is only introspected once per process. Treat the result as
+    read-only.
+    """
+    if not hasattr(response_format, "model_json_schema"):
+        return None
+    return response_format.model_json_schema()
+
+
+@functools.cache
+def _get_schema_instruction(response_format: Any) -> str | None:
+    """Get (and memoize) the prompt suffix asking for JSON matching the response_format schema."""
+    schema = _get_json_schema(response_format)
+    if schema is None:
+        return None
+    return f"\n\nYou must respond with valid JSON matching this schema:\n{json.dumps(schema, indent=2)}"
+
+
+def _add_schema_instruction(messages: list[dict[str, str]], schema_msg: str) -> list[dict[str, str]]:
+    """
+    Return a copy of messages with the schema instruction added to the first message.
+
+    Appended to a leading system message, otherwise prepended to the first message. The
+    caller's list and message dicts are not modified, so reusing them is safe.
+    """
+    first = dict(messages[0])
+    if first.get("role") == "system":
+        first["content"] = first["content"] + schema_msg
+    else:
+        first["content"] = schema_msg + "\n\n" + first["content"]
+    return [first, *messages[1:]]
+
+
 # Global semaphore to limit concurrent LLM requests across all instances
 # Set HINDSIGHT_API_LLM_MAX_CONCURRENT=1 for local LLMs (LM Studio, Ollama)
 _llm_max_concurrent = int(os.getenv(ENV_LLM_MAX_CONCURRENT, str(DEFAULT_LLM_MAX_CONCURRENT)))
 _global_llm_semaphore = asyncio.Semaphore(_llm_max_concurrent)
 
 
+class _TokenBudget:
+    """
+    Token bucket of estimated prompt tokens per minute, shared by all LLM requests.
+
+    Large ingests fan out one request per chunk; without a budget they burst past the
+    provider's tokens-per-minute limit and end up in 429 retry/backoff storms.
+    """
+
+    def __init__(self, tokens_per_minute: int):
+        self.capacity = tokens_per_minute
+        self._available = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int) -> None:
+        """Wait until the budget covers the given number of tokens, then consume them."""
+        # A single request larger than the whole budget only waits for a full bucket
+        tokens = min(tokens, self.capacity)
+        # Waiters queue on the lock, so requests are admitted in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._available = min(self.capacity, self._available + (now - self._updated) * self.capacity / 60)
+                self._updated = now
+                if self._available >= tokens:
+                    self._available -= tokens
+                    return
+                await asyncio.sleep((tokens - self._available) * 60 / self.capacity)
+
+
+# Set HINDSIGHT_API_LLM_MAX_TOKENS_PER_MINUTE to stay under a provider TPM limit
+_llm_max_tokens_per_minute = int(os.getenv(ENV_LLM_MAX_TOKENS_PER_MINUTE, str(DEFAULT_LLM_MAX_TOKENS_PER_MINUTE)))
+_global_token_budget = _TokenBudget(_llm_max_tokens_per_minute) if _llm_max_tokens_per_minute > 0 else None
+
+
+def _estimate_prompt_tokens(messages: list[dict[str, str]]) -> int:
+    """Roughly estimate the prompt tokens of a request (~4 chars per token)."""
+    return sum(len(message.get("content") or "") for message in messages) // 4
+
+
 class OutputTooLongError(Exception):
     """
     Bridge exception raised when LLM output exceeds token limits.
@@ -50,6 +134,17 @@ class OutputTooLongError(Exception):
     pass
 
 
+class LLMTimeoutError(Exception):
+    """
+    Bridge exception raised when an LLM request still times out after all retries.
+
+    Like OutputTooLongError, this lets callers react (e.g. by sending a smaller
+    input) without depending on provider-specific exception types.
+    """
+
+    pass
+
+
 class LLMProvider:
     """
     Unified LLM provider.
@@ -174,6 +269,7 @@ class LLMProvider:
         max_backoff: float = 60.0,
         skip_validation: bool = False,
         strict_schema: bool = False,
+        seed: int | None = None,
     ) -> Any:
         """
         Make an LLM API call with retry logic.
@@ -189,14 +285,21 @@ class LLMProvider:
             max_backoff: Maximum backoff time in seconds.
             skip_validation: Return raw JSON without Pydantic validation.
             strict_schema: Use strict JSON schema enforcement (OpenAI only). Guarantees all required fields.
+            seed: Sampling seed (OpenAI-compatible providers only). Groq defaults to DEFAULT_LLM_SEED.
 
         Returns:
             Parsed response if response_format is provided, otherwise text content.
 
         Raises:
             OutputTooLongError: If output exceeds token limits.
+            LLMTimeoutError: If the request times out on every attempt (OpenAI-compatible and Anthropic).
             Exception: Re-raises API errors after retries exhausted.
         """
+        # Wait for the token budget before taking a concurrency slot, so a throttled
+        # request does not hold one while it sleeps
+        if _global_token_budget is not None:
+            await _global_token_budget.acquire(_estimate_prompt_tokens(messages))
+
         async with _global_llm_semaphore:
             start_time = time.time()
 
@@ -233,59 +336,22 @@ class LLMProvider:
                     start_time,
                 )
 
-            call_params = {
-                "model": self.model,
-                "messages": messages,
-            }
-
-            # Check if model supports reasoning parameter (o1, o3, gpt-5 families)
-            model_lower = self.model.lower()
-            is_reasoning_model = any(x in model_lower for x in ["gpt-5", "o1", "o3", "deepseek"])
-
-            # For GPT-4 and GPT-4.1 models, cap max_completion_tokens to 32000
-            # For GPT-4o models, cap to 16384
-            is_gpt4_model = any(x in model_lower for x in ["gpt-4.1", "gpt-4-"])
-            is_gpt4o_model = "gpt-4o" in model_lower
-            if max_completion_tokens is not None:
-                if is_gpt4o_model and max_completion_tokens > 16384:
-                    max_completion_tokens = 16384
-                elif is_gpt4_model and max_completion_tokens > 32000:
-                    max_completion_tokens = 32000
-                # For reasoning models, max_completion_tokens includes reasoning + output tokens
-                # Enforce minimum of 16000 to ensure enough space for both
-                if is_reasoning_model and max_completion_tokens < 16000:
-                    max_completion_tokens = 16000
-                call_params["max_completion_tokens"] = max_completion_tokens
-
-            # GPT-5/o1/o3 family doesn't support custom temperature (only default 1)
-            if temperature is not None and not is_reasoning_model:
-                call_params["temperature"] = temperature
-
-            # Set reasoning_effort for reasoning models (OpenAI gpt-5, o1, o3)
-            if is_reasoning_model:
-                call_params["reasoning_effort"] = self.reasoning_effort
+            call_params = self._chat_completion_params(messages, max_completion_tokens, temperature, seed)
 
-            # Provider-specific parameters
-            if self.provider == "groq":
-                call_params["seed"] = DEFAULT_LLM_SEED
-                extra_body: dict[str, Any] = {}
-                # Add service_tier if configured (requires paid plan for flex/auto)
-                if self.groq_service_tier:
-                    extra_body["service_tier"] = self.groq_service_tier
-                # Add reasoning parameters for reasoning models
-                if is_reasoning_model:
-                    extra_body["include_reasoning"] = False
-                if extra_body:
-                    call_params["extra_body"] = extra_body
+            # Soft schema enforcement puts the schema into the first message. Build that copy once
+            # up front: every retry sends the same messages, and the caller's are left untouched
+            if response_format is not None and not strict_schema and messages:
+                if _get_json_schema(response_format) is not None:
+                    call_params["messages"] = _add_schema_instruction(
+                        messages, _get_schema_instruction(response_format)
+                    )
 
             last_exception = None
 
             for attempt in range(max_retries + 1):
                 try:
                     if response_format is not None:
-                        schema = None
-                        if hasattr(response_format, "model_json_schema"):
-                            schema = response_format.model_json_schema()
+                        schema = _get_json_schema(response_format)
 
                         if strict_schema and schema is not None:
                             # Use OpenAI's strict JSON schema enforcement
@@ -299,16 +365,7 @@ class LLMProvider:
                                 },
                             }
                         else:
-                            # Soft enforcement: add schema to prompt and use json_object mode
-                            if schema is not None:
-                                schema_msg = f"\n\nYou must respond with valid JSON matching this schema:\n{json.dumps(schema, indent=2)}"
-
-                                if call_params["messages"] and call_params["messages"][0].get("role") == "system":
-                                    call_params["messages"][0]["content"] += schema_msg
-                                elif call_params["messages"]:
-                                    call_params["messages"][0]["content"] = (
-                                        schema_msg + "\n\n" + call_params["messages"][0]["content"]
-                                    )
+                            # Soft enforcement: schema in the prompt (added above) and json_object mode
                             if self.provider not in ("lmstudio", "ollama"):
                                 # LM Studio and Ollama don't support json_object response format reliably
                                 # We rely on the schema in the system message instead
@@ -345,11 +402,25 @@ class LLMProvider:
                             except json.JSONDecodeError:
                                 # Fallback to parsing raw content
                                 json_data = json.loads(content)
+                            if skip_validation:
+                                result = json_data
+                            else:
+                                result = response_format.model_validate(json_data)
                         else:
                             # Log raw LLM response for debugging JSON parse issues
                             try:
-                                json_data = json.loads(content)
-                            except json.JSONDecodeError as json_err:
+                                if skip_validation:
+                                    result = json.loads(content)
+                                else:
+                                    # Parse and validate in one pass (pydantic-core's JSON parser)
+                                    # instead of building Python objects with json.loads first
+                                    result = response_format.model_validate_json(content)
+                            except (json.JSONDecodeError, ValidationError) as json_err:
+                                # Only unparseable JSON is retried; schema mismatches propagate as before
+                                if isinstance(json_err, ValidationError) and not any(
+                                    error["type"] == "json_invalid" for error in json_err.errors()
+                                ):
+                                    raise
                                 # Truncate content for logging (first 500 and last 200 chars)
                                 content_preview = content[:500] if content else "<empty>"
                                 if content and len(content) > 700:
@@ -370,11 +441,6 @@ class LLMProvider:
                                 else:
                                     logger.error(f"JSON parse error after {max_retries + 1} attempts, giving up")
                                     raise
-
-                        if skip_validation:
-                            result = json_data
-                        else:
-                            result = response_format.model_validate(json_data)
                     else:
                         response = await self._client.chat.completions.create(**call_params)
                         result = response.choices[0].message.content
@@ -416,6 +482,8 @@ class LLMProvider:
                         continue
                     else:
                         logger.error(f"Connection error after {max_retries + 1} attempts: {str(e)}")
+                        if isinstance(e, APITimeoutError):
+                            raise LLMTimeoutError(f"LLM request timed out after {max_retries + 1} attempts") from e
                         raise
 
                 except APIStatusError as e:
@@ -442,6 +510,117 @@ class LLMProvider:
                 raise last_exception
             raise RuntimeError("LLM call failed after all retries with no exception captured")
 
+    def _chat_completion_params(
+        self,
+        messages: list[dict[str, str]],
+        max_completion_tokens: int | None,
+        temperature: float | None,
+        seed: int | None,
+    ) -> dict[str, Any]:
+        """Build the chat.completions parameters shared by call() and call_stream() (OpenAI-compatible)."""
+        call_params = {
+            "model": self.model,
+            "messages": messages,
+        }
+
+        # Check if model supports reasoning parameter (o1, o3, gpt-5 families)
+        model_lower = self.model.lower()
+        is_reasoning_model = any(x in model_lower for x in ["gpt-5", "o1", "o3", "deepseek"])
+
+        # For GPT-4 and GPT-4.1 models, cap max_completion_tokens to 32000
+        # For GPT-4o models, cap to 16384
+        is_gpt4_model = any(x in model_lower for x in ["gpt-4.1", "gpt-4-"])
+        is_gpt4o_model = "gpt-4o" in model_lower
+        if max_completion_tokens is not None:
+            if is_gpt4o_model and max_completion_tokens > 16384:
+                max_completion_tokens = 16384
+            elif is_gpt4_model and max_completion_tokens > 32000:
+                max_completion_tokens = 32000
+            # For reasoning models, max_completion_tokens includes reasoning + output tokens
+            # Enforce minimum of 16000 to ensure enough space for both
+            if is_reasoning_model and max_completion_tokens < 16000:
+                max_completion_tokens = 16000
+            call_params["max_completion_tokens"] = max_completion_tokens
+
+        # GPT-5/o1/o3 family doesn't support custom temperature (only default 1)
+        if temperature is not None and not is_reasoning_model:
+            call_params["temperature"] = temperature
+
+        # Set reasoning_effort for reasoning models (OpenAI gpt-5, o1, o3)
+        if is_reasoning_model:
+            call_params["reasoning_effort"] = self.reasoning_effort
+
+        if seed is not None:
+            call_params["seed"] = seed
+
+        # Provider-specific parameters
+        if self.provider == "groq":
+            call_params["seed"] = DEFAULT_LLM_SEED if seed is None else seed
+            extra_body: dict[str, Any] = {}
+            # Add service_tier if configured (requires paid plan for flex/auto)
+            if self.groq_service_tier:
+                extra_body["service_tier"] = self.groq_service_tier
+            # Add reasoning parameters for reasoning models
+            if is_reasoning_model:
+                extra_body["include_reasoning"] = False
+            if extra_body:
+                call_params["extra_body"] = extra_body
+
+        return call_params
+
+    async def call_stream(
+        self,
+        messages: list[dict[str, str]],
+        max_completion_tokens: int | None = None,
+        temperature: float | None = None,
+        scope: str = "memory",
+        seed: int | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Make a plain-text LLM API call and yield the answer as it is generated.
+
+        OpenAI-compatible providers stream natively. Gemini and Anthropic fall back to a
+        regular call() and yield the whole answer as a single chunk. There is no retry:
+        a failure after part of the answer was yielded cannot be replayed, so errors are
+        raised to the consumer. Reasoning tags embedded in the output are not stripped.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            max_completion_tokens: Maximum tokens in response.
+            temperature: Sampling temperature (0.0-2.0).
+            scope: Scope identifier for tracking.
+            seed: Sampling seed (OpenAI-compatible providers only). Groq defaults to DEFAULT_LLM_SEED.
+
+        Yields:
+            Text chunks of the answer, in order.
+
+        Raises:
+            LLMTimeoutError: If the request times out (OpenAI-compatible providers).
+        """
+        if self.provider in ("gemini", "anthropic"):
+            yield await self.call(
+                messages=messages,
+                max_completion_tokens=max_completion_tokens,
+                temperature=temperature,
+                scope=scope,
+                seed=seed,
+            )
+            return
+
+        if _global_token_budget is not None:
+            await _global_token_budget.acquire(_estimate_prompt_tokens(messages))
+
+        # The concurrency slot is held until the stream is exhausted or closed
+        async with _global_llm_semaphore:
+            call_params = self._chat_completion_params(messages, max_completion_tokens, temperature, seed)
+            try:
+                stream = await self._client.chat.completions.create(**call_params, stream=True)
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            except APITimeoutError as e:
+                raise LLMTimeoutError("LLM streaming request timed out") from e
+
     async def _call_anthropic(
         self,
         messages: list[dict[str, str]],
@@ -454,7 +633,7 @@ class LLMProvider:
         start_time: float,
     ) -> Any:
         """Handle Anthropic-specific API calls."""
-        from anthropic import APIConnectionError, APIStatusError, RateLimitError
+        from anthropic import APIConnectionError, APIStatusError, APITimeoutError, RateLimitError
 
         # Convert OpenAI-style messages to Anthropic format
         system_prompt = None
@@ -474,8 +653,7 @@ class LLMProvider:
 
         # Add JSON schema instruction if response_format is provided
         if response_format is not None and hasattr(response_format, "model_json_schema"):
-            schema = response_format.model_json_schema()
-            schema_msg = f"\n\nYou must respond with valid JSON matching this schema:\n{json.dumps(schema, indent=2)}"
+            schema_msg = _get_schema_instruction(response_format)
             if system_prompt:
                 system_prompt += schema_msg
             else:
@@ -489,7 +667,10 @@ class LLMProvider:
         }
 
         if system_prompt:
-            call_params["system"] = system_prompt
+            # Mark the system prompt (long, fixed instructions + schema) for prompt caching so
+            # repeated calls reuse the cached prefix; Anthropic ignores the marker for prompts
+            # below its minimum cacheable length. OpenAI and Gemini cache prefixes automatically.
+            call_params["system"] = [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
 
         last_exception = None
 
@@ -568,6 +749,8 @@ class LLMProvider:
                         continue
 
                 logger.error(f"Anthropic API error after {max_retries + 1} attempts: {str(e)}")
+                if isinstance(e, APITimeoutError):
+                    raise LLMTimeoutError(f"Anthropic request timed out after {max_retries + 1} attempts") from e
                 raise
 
             except Exception as e:
@@ -597,7 +780,7 @@ class LLMProvider:
         which provides better structured output control than the OpenAI-compatible API.
         """
         # Get the JSON schema from the Pydantic model
-        schema = response_format.model_json_schema() if hasattr(response_format, "model_json_schema") else None
+        schema = _get_json_schema(response_format)
 
         # Build the base URL for Ollama's native API
         # Default OpenAI-compatible URL is http://localhost:11434/v1
@@ -732,8 +915,7 @@ class LLMProvider:
 
         # Add JSON schema instruction if response_format is provided
         if response_format is not None and hasattr(response_format, "model_json_schema"):
-            schema = response_format.model_json_schema()
-            schema_msg = f"\n\nYou must respond with valid JSON matching this schema:\n{json.dumps(schema, indent=2)}"
+            schema_msg = _get_schema_instruction(response_format)
             if system_instruction:
                 system_instruction += schema_msg
             else:
@@ -6,16 +6,50 @@ Uses the LLMConfig wrapper for all LLM calls.
 """
 
 import asyncio
-import json
+import functools
+import hashlib
 import logging
 import os
+import random
 import re
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from itertools import groupby
+from operator import attrgetter
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
-
-from ..llm_wrapper import LLMConfig, OutputTooLongError
+import orjson
+from dateutil import parser as date_parser
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, ValidationError, field_validator
+
+from ...config import DEFAULT_FACT_EXTRACTION_CACHE_SIZE, ENV_FACT_EXTRACTION_CACHE_SIZE
+from ..llm_wrapper import LLMConfig, LLMTimeoutError, OutputTooLongError
+
+
+# Relative time expressions mapped to day offsets, in priority order (an earlier entry
+# wins when a fact contains several)
+_TEMPORAL_OFFSETS: tuple[tuple[str, int], ...] = (
+    (r"\blast night\b", -1),
+    (r"\byesterday\b", -1),
+    (r"\btoday\b", 0),
+    (r"\bthis morning\b", 0),
+    (r"\bthis afternoon\b", 0),
+    (r"\bthis evening\b", 0),
+    (r"\btonigh?t\b", 0),
+    (r"\btomorrow\b", 1),
+    (r"\blast week\b", -7),
+    (r"\bthis week\b", 0),
+    (r"\bnext week\b", 7),
+    (r"\blast month\b", -30),
+    (r"\bthis month\b", 0),
+    (r"\bnext month\b", 30),
+)
+
+# All expressions as one case-insensitive alternation (so fact text needn't be lowercased
+# first); the named group (p<index>) identifies which one matched
+_TEMPORAL_RE = re.compile(
+    "|".join(f"(?P<p{i}>{pattern})" for i, (pattern, _) in enumerate(_TEMPORAL_OFFSETS)), re.IGNORECASE
+)
 
 
 def _infer_temporal_date(fact_text: str, event_date: datetime) -> str | None:
@@ -25,35 +59,25 @@ def _infer_temporal_date(fact_text: str, event_date: datetime) -> str | None:
     This is a fallback for when the LLM fails to extract temporal information
     from relative time expressions like "last night", "yesterday", etc.
     """
-    import re
-
-    fact_lower = fact_text.lower()
-
-    # Map relative time expressions to day offsets
-    temporal_patterns = {
-        r"\blast night\b": -1,
-        r"\byesterday\b": -1,
-        r"\btoday\b": 0,
-        r"\bthis morning\b": 0,
-        r"\bthis afternoon\b": 0,
-        r"\bthis evening\b": 0,
-        r"\btonigh?t\b": 0,
-        r"\btomorrow\b": 1,
-        r"\blast week\b": -7,
-        r"\bthis week\b": 0,
-        r"\bnext week\b": 7,
-        r"\blast month\b": -30,
-        r"\bthis month\b": 0,
-        r"\bnext month\b": 30,
-    }
+    # Single scan over the text; facts without a relative expression (the common case) miss here.
+    # A leftmost search() alone isn't enough, since priority (not position) picks the offset,
+    # but the scan stops as soon as the highest-priority expression is found.
+    best = None
+    for match in _TEMPORAL_RE.finditer(fact_text):
+        index = int(match.lastgroup[1:])
+        if best is None or index < best:
+            best = index
+            if best == 0:
+                break
+    if best is None:
+        return None
 
-    for pattern, offset_days in temporal_patterns.items():
-        if re.search(pattern, fact_lower):
-            target_date = event_date + timedelta(days=offset_days)
-            return target_date.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+    offset_days = _TEMPORAL_OFFSETS[best][1]
+    target_date = event_date + timedelta(days=offset_days)
+    return target_date.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
 
-    # If no relative time expression found, return None
-    return None
+
+_SURROGATE_RE = re.compile(r"[\ud800-\udfff]")
 
 
 def _sanitize_text(text: str) -> str:
@@ -69,9 +93,16 @@ def _sanitize_text(text: str) -> str:
     """
     if not text:
         return text
-    # Remove surrogate characters (U+D800 to U+DFFF) using regex
+    # Remove surrogate characters (U+D800 to U+DFFF) using the precompiled regex
     # These are invalid in UTF-8 and cause encoding errors
-    return re.sub(r"[\ud800-\udfff]", "", text)
+    # Clean text (the common case) is returned as-is after a single scan, without allocating
+    if not _SURROGATE_RE.search(text):
+        return text
+    return _SURROGATE_RE.sub("", text)
+
+
+# Every casing of "N/A" (what `value.upper() == "N/A"` matches), for allocation-free checks
+_NA_VALUES = frozenset({"N/A", "n/a", "N/a", "n/A"})
 
 
 class Entity(BaseModel):
@@ -237,20 +268,13 @@ class ExtractedFact(BaseModel):
 
     def build_fact_text(self) -> str:
         """Combine all dimensions into a single comprehensive fact string."""
-        parts = [self.what]
-
-        # Add 'who' if not N/A
-        if self.who and self.who.upper() != "N/A":
-            parts.append(f"涉及：{self.who}")
-
-        # Add 'why' if not N/A
-        if self.why and self.why.upper() != "N/A":
-            parts.append(self.why)
+        # Add 'who' and 'why' if not N/A
+        who = f"涉及：{self.who}" if self.who and self.who not in _NA_VALUES else None
+        why = self.why if self.why and self.why not in _NA_VALUES else None
+        if not who and not why:
+            return self.what
 
-        if len(parts) == 1:
-            return parts[0]
-
-        return " | ".join(parts)
+        return " | ".join(part for part in (self.what, who, why) if part)
 
 
 class FactExtractionResponse(BaseModel):
@@ -259,37 +283,20 @@ class FactExtractionResponse(BaseModel):
     facts: list[ExtractedFact] = Field(description="抽取到的事实列表")
 
 
-def chunk_text(text: str, max_chars: int) -> list[str]:
-    """
-    Split text into chunks, preserving conversation structure when possible.
-
-    For JSON conversation arrays (user/assistant turns), splits at turn boundaries
-    while preserving speaker context. For plain text, uses sentence-aware splitting.
+# Whole-list validators for the per-fact entities / causal_relations arrays
+_ENTITY_LIST_ADAPTER = TypeAdapter(list[Entity])
+_CAUSAL_RELATION_LIST_ADAPTER = TypeAdapter(list[CausalRelation])
 
-    Args:
-        text: Input text to chunk (plain text or JSON conversation)
-        max_chars: Maximum characters per chunk (default 120k ≈ 30k tokens)
 
-    Returns:
-        List of text chunks, roughly under max_chars
-    """
-    from langchain_text_splitters import RecursiveCharacterTextSplitter
+_JSON_ARRAY_START = re.compile(r"\s*\[")
 
-    # If text is small enough, return as-is
-    if len(text) <= max_chars:
-        return [text]
 
-    # Try to parse as JSON conversation array
-    try:
-        parsed = json.loads(text)
-        if isinstance(parsed, list) and all(isinstance(turn, dict) for turn in parsed):
-            # This looks like a conversation - chunk at turn boundaries
-            return _chunk_conversation(parsed, max_chars)
-    except (json.JSONDecodeError, ValueError):
-        pass
+@functools.lru_cache(maxsize=8)
+def _get_text_splitter(max_chars: int):
+    """Get the (cached) sentence-aware splitter for a chunk size; langchain is imported on first use."""
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-    # Fall back to sentence-aware text splitting
-    splitter = RecursiveCharacterTextSplitter(
+    return RecursiveCharacterTextSplitter(
         chunk_size=max_chars,
         chunk_overlap=0,
         length_function=len,
@@ -307,7 +314,38 @@ def chunk_text(text: str, max_chars: int) -> list[str]:
         ],
     )
 
-    return splitter.split_text(text)
+
+def chunk_text(text: str, max_chars: int) -> list[str]:
+    """
+    Split text into chunks, preserving conversation structure when possible.
+
+    For JSON conversation arrays (user/assistant turns), splits at turn boundaries
+    while preserving speaker context. For plain text, uses sentence-aware splitting.
+
+    Args:
+        text: Input text to chunk (plain text or JSON conversation)
+        max_chars: Maximum characters per chunk (default 120k ≈ 30k tokens)
+
+    Returns:
+        List of text chunks, roughly under max_chars
+    """
+    # If text is small enough, return as-is
+    if len(text) <= max_chars:
+        return [text]
+
+    # Try to parse as JSON conversation array (only if it can be one, so large plain
+    # text isn't run through the JSON parser just to fail)
+    if _JSON_ARRAY_START.match(text):
+        try:
+            parsed = orjson.loads(text)
+            if isinstance(parsed, list) and all(isinstance(turn, dict) for turn in parsed):
+                # This looks like a conversation - chunk at turn boundaries
+                return _chunk_conversation(parsed, max_chars)
+        except ValueError:  # orjson.JSONDecodeError is a ValueError
+            pass
+
+    # Fall back to sentence-aware text splitting
+    return _get_text_splitter(max_chars).split_text(text)
 
 
 def _chunk_conversation(turns: list[dict], max_chars: int) -> list[str]:
@@ -322,50 +360,278 @@ def _chunk_conversation(turns: list[dict], max_chars: int) -> list[str]:
         List of JSON-serialized chunks, each containing complete turns
     """
 
+    # Serialize every turn exactly once; chunks are assembled from the cached strings.
+    # orjson emits compact UTF-8 (no whitespace, no ASCII escaping), which also keeps
+    # LLM tokens down. Decoded to str so sizes are measured in characters like max_chars.
+    turn_jsons = [orjson.dumps(turn).decode() for turn in turns]
+
     chunks = []
-    current_chunk = []
+    chunk_start = 0
     current_size = 2  # Account for "[]"
 
-    for turn in turns:
-        # Estimate size of this turn when serialized (with comma separator)
-        turn_json = json.dumps(turn, ensure_ascii=False)
+    for i, turn_json in enumerate(turn_jsons):
         turn_size = len(turn_json) + 1  # +1 for comma
 
         # If adding this turn would exceed limit and we have turns, save current chunk
-        if current_size + turn_size > max_chars and current_chunk:
-            chunks.append(json.dumps(current_chunk, ensure_ascii=False))
-            current_chunk = []
+        if current_size + turn_size > max_chars and i > chunk_start:
+            chunks.append("[" + ",".join(turn_jsons[chunk_start:i]) + "]")
+            chunk_start = i
             current_size = 2  # Reset to "[]"
 
-        # Add turn to current chunk
-        current_chunk.append(turn)
         current_size += turn_size
 
     # Add final chunk if non-empty
-    if current_chunk:
-        chunks.append(json.dumps(current_chunk, ensure_ascii=False))
+    if chunk_start < len(turn_jsons):
+        chunks.append("[" + ",".join(turn_jsons[chunk_start:]) + "]")
 
-    return chunks if chunks else [json.dumps(turns, ensure_ascii=False)]
+    return chunks if chunks else ["[]"]
 
 
-async def _extract_facts_from_chunk(
-    chunk: str,
-    chunk_index: int,
-    total_chunks: int,
-    event_date: datetime,
-    context: str,
-    llm_config: "LLMConfig",
-    agent_name: str = None,
-    extract_opinions: bool = False,
-) -> list[dict[str, str]]:
+def _normalize_llm_fact(llm_fact: dict) -> dict:
     """
-    Extract facts from a single chunk (internal helper for parallel processing).
+    Copy a raw LLM fact with empty values and "N/A" mapped to None, in one pass.
 
-    Note: event_date parameter is kept for backward compatibility but not used in prompt.
-    The LLM extracts temporal information from the context string instead.
+    The LLM returns ~10 keys per fact, so normalizing them all up front is cheaper than
+    a separate lookup-and-check per field read.
     """
-    memory_bank_context = f"\n- Your name: {agent_name}" if agent_name and extract_opinions else ""
+    # Falsy covers None, "", [] and {}; only strings can spell "N/A", so lists and dicts
+    # (entities, causal_relations) are never stringified just for that check
+    return {
+        key: None if not value or (isinstance(value, str) and value in _NA_VALUES) else value
+        for key, value in llm_fact.items()
+    }
+
+
+def _validate_list(adapter: TypeAdapter, model: type[BaseModel], items: list, label: str) -> list:
+    """
+    Validate a list of raw dicts in a single TypeAdapter call.
+
+    If any item is invalid, falls back to validating item by item so only the invalid
+    ones are dropped (with a warning), as the LLM output is parsed leniently.
+    """
+    try:
+        return adapter.validate_python(items)
+    except ValidationError:
+        validated = []
+        for item in items:
+            try:
+                validated.append(model.model_validate(item))
+            except ValidationError as e:
+                logger.warning(f"Invalid {label} {item}: {e}")
+        return validated
+
+
+def _validate_llm_fact(i: int, llm_fact: dict, max_idx: int, event_date: datetime) -> Fact | None:
+    """
+    Leniently convert one raw fact from the LLM response into a Fact.
+
+    Args:
+        i: Index of the fact in the LLM's facts array
+        llm_fact: Raw fact dict from the LLM
+        max_idx: Highest valid index in the LLM's facts array (for causal relation targets)
+        event_date: Reference date for temporal inference and mentioned_at
+
+    Returns:
+        The Fact, or None if the fact has no 'what' and is skipped.
+        Raises if the Fact model cannot be built from the extracted fields.
+    """
+    values = _normalize_llm_fact(llm_fact)
+
+    # NEW FORMAT: what, when, who, why (all required)
+    what = values.get("what")
+    when = values.get("when")
+    who = values.get("who")
+    why = values.get("why")
+
+    # Fallback to old format if new fields not present
+    if not what:
+        what = values.get("factual_core")
+    if not what:
+        logger.warning(f"Skipping fact {i}: missing 'what' field")
+        return None
+
+    # Critical field: fact_type
+    # LLM uses "assistant" but we convert to "experience" for storage
+    fact_type = llm_fact.get("fact_type")
+
+    # Convert "assistant" → "experience" for storage
+    if fact_type == "assistant":
+        fact_type = "experience"
+
+    # Validate fact_type (after conversion)
+    if fact_type not in ["world", "experience", "opinion"]:
+        # Try to fix common mistakes - check if they swapped fact_type and fact_kind
+        fact_kind = llm_fact.get("fact_kind")
+        if fact_kind == "assistant":
+            fact_type = "experience"
+        elif fact_kind in ["world", "experience", "opinion"]:
+            fact_type = fact_kind
+        else:
+            # Default to 'world' if we can't determine
+            fact_type = "world"
+            logger.warning(f"Fact {i}: defaulting to fact_type='world'")
+
+    # Get fact_kind for temporal handling (but don't store it)
+    fact_kind = llm_fact.get("fact_kind", "conversation")
+    if fact_kind not in ["conversation", "event", "other"]:
+        fact_kind = "conversation"
+
+    # Build combined fact text from the 4 dimensions: what | when | who | why
+    fact_data = {}
+    combined_text = " | ".join(
+        part for part in (what, when and f"时间：{when}", who and f"涉及：{who}", why) if part
+    )
+
+    # Add temporal fields
+    # For events: occurred_start/occurred_end (when the event happened)
+    if fact_kind == "event":
+        occurred_start = values.get("occurred_start")
+        occurred_end = values.get("occurred_end")
+
+        # If LLM didn't set temporal fields, try to extract them from the fact text
+        if not occurred_start:
+            fact_data["occurred_start"] = _infer_temporal_date(combined_text, event_date)
+        else:
+            fact_data["occurred_start"] = occurred_start
+
+        # For point events: if occurred_end not set, default to occurred_start
+        if occurred_end:
+            fact_data["occurred_end"] = occurred_end
+        elif fact_data.get("occurred_start"):
+            fact_data["occurred_end"] = fact_data["occurred_start"]
+
+    # Add entities if present (validate as Entity objects)
+    # LLM sometimes returns strings instead of {"text": "..."} format
+    entities = values.get("entities")
+    if entities:
+        # Normalize strings to {"text": ...} and drop anything else that isn't entity-shaped
+        normalized_entities = [
+            {"text": ent} if isinstance(ent, str) else ent
+            for ent in entities
+            if isinstance(ent, str) or (isinstance(ent, dict) and "text" in ent)
+        ]
+        validated_entities = _validate_list(_ENTITY_LIST_ADAPTER, Entity, normalized_entities, "entity")
+        if validated_entities:
+            fact_data["entities"] = validated_entities
+
+    # Add causal relations if present (validate as CausalRelation objects)
+    # Filter out invalid relations:
+    # - must have required fields
+    # - target_fact_index must be within [0, max_idx]
+    # - only allow linking to earlier facts in this same LLM response (target_fact_index < i)
+    causal_relations = values.get("causal_relations")
+    if causal_relations:
+        candidate_relations = [
+            rel
+            for rel in causal_relations
+            if isinstance(rel, dict) and "target_fact_index" in rel and "relation_type" in rel
+        ]
+        validated_relations = []
+        for rel_obj in _validate_list(
+            _CAUSAL_RELATION_LIST_ADAPTER, CausalRelation, candidate_relations, "causal relation"
+        ):
+            t = rel_obj.target_fact_index
+            if not isinstance(t, int) or t < 0 or t > max_idx or t >= i:
+                # Drop silently; we also sanitize later after compaction.
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"Dropped causal relation with invalid/forward target_fact_index={t} "
+                        f"(fact_index={i}, max_idx={max_idx})"
+                    )
+                continue
+
+            validated_relations.append(rel_obj)
+
+        if validated_relations:
+            fact_data["causal_relations"] = validated_relations
+
+    # Always set mentioned_at to the event_date (when the conversation/document occurred)
+    fact_data["mentioned_at"] = event_date.isoformat()
+
+    return Fact(fact=combined_text, fact_type=fact_type, **fact_data)
+
+
+# LRU of raw LLM extraction responses, keyed by a hash of everything that shapes the prompt.
+# Only responses without malformed facts are cached; a hit still goes through validation.
+# Size is HINDSIGHT_API_FACT_EXTRACTION_CACHE_SIZE (0 disables it), read once at import.
+_extraction_cache_size = int(os.getenv(ENV_FACT_EXTRACTION_CACHE_SIZE, str(DEFAULT_FACT_EXTRACTION_CACHE_SIZE)))
+_extraction_cache: OrderedDict[str, dict] = OrderedDict()
+
+
+def _extraction_cache_key(*parts: str) -> str:
+    """Hash the extraction inputs (blake2b: fast, and 128 bits makes collisions a non-issue)."""
+    return hashlib.blake2b("\x00".join(parts).encode(), digest_size=16).hexdigest()
 
+
+# Retries per extraction call. The client already bounds each request with
+# HINDSIGHT_API_LLM_TIMEOUT, so this caps how long one slow chunk can hold up the gather
+# over all chunks (the wrapper default of 10 retries allows minutes of backoff).
+EXTRACTION_MAX_RETRIES = 3
+# Base for the per-attempt extraction sampling seed: a retry after invalid JSON or malformed
+# facts uses a new seed, so seeded providers (Groq) don't just repeat the same output
+EXTRACTION_RETRY_SEED = 4242
+# Chunks shorter than this are not split further when their request times out
+MIN_TIMEOUT_SPLIT_CHARS = 2000
+
+
+def _extraction_retry_backoff(attempt: int) -> float:
+    """Jittered exponential backoff (seconds) before retrying a failed extraction attempt."""
+    return min(30.0, 2.0**attempt) * (0.5 + random.random())
+
+
+# Sentence endings and paragraph breaks that make good split points for an oversized chunk
+_SPLIT_BOUNDARY_RE = re.compile(r"[.!?] |\n\n")
+
+_WEEKDAYS_CN = ("周一", "周二", "周三", "周四", "周五", "周六", "周日")
+
+
+@functools.lru_cache(maxsize=256)
+def _format_event_date(event_date: datetime) -> str:
+    """
+    Format event_date for the user message, with day of week for better temporal reasoning.
+
+    Example: "2024-06-10（周一）（2024-06-10T09:00:00+00:00）". Cached because every chunk
+    of a document shares the same event_date.
+    """
+    return f"{event_date:%Y-%m-%d}（{_WEEKDAYS_CN[event_date.weekday()]}）（{event_date.isoformat()}）"
+
+
+def _build_facts_from_raw(raw_facts: list, event_date: datetime) -> tuple[list[Fact], bool]:
+    """
+    Leniently convert the LLM's raw facts array into Fact models.
+
+    Returns:
+        Tuple of (facts, has_malformed_facts) where has_malformed_facts is True if any
+        entry was not a dict or could not be turned into a Fact (used to decide on a retry)
+    """
+    chunk_facts = []
+    has_malformed_facts = False
+    max_idx = len(raw_facts) - 1  # raw_facts is the LLM's facts array for this chunk
+
+    # Skip non-dict entries up front but track them for retry (indices are kept
+    # because causal relations refer to positions in raw_facts)
+    dict_facts = [(i, llm_fact) for i, llm_fact in enumerate(raw_facts) if isinstance(llm_fact, dict)]
+    if len(dict_facts) < len(raw_facts):
+        skipped = [i for i, llm_fact in enumerate(raw_facts) if not isinstance(llm_fact, dict)]
+        logger.warning(f"Skipping non-dict facts at indices {skipped}")
+        has_malformed_facts = True
+
+    for i, llm_fact in dict_facts:
+        # Build Fact model instance
+        try:
+            fact = _validate_llm_fact(i, llm_fact, max_idx, event_date)
+        except Exception as e:
+            logger.error(f"Failed to create Fact model for fact {i}: {e}")
+            has_malformed_facts = True
+            continue
+        if fact is not None:
+            chunk_facts.append(fact)
+
+    return chunk_facts, has_malformed_facts
+
+
+def _build_extraction_prompt(extract_opinions: bool) -> str:
+    """Build the fact extraction system prompt (only the fact type instruction varies)."""
     # Determine which fact types to extract based on the flag
     # Note: We use "assistant" in the prompt but convert to "bank" for storage
     if extract_opinions:
@@ -376,7 +642,7 @@ async def _extract_facts_from_chunk(
             "仅抽取 fact_type 为 'world' 与 'assistant' 的事实。不要抽取观点（opinions）——观点会在单独步骤中抽取。"
         )
 
-    prompt = f"""请从文本中抽取事实，并以结构化 JSON 输出。要求：**极度详细**，宁可多写，不要漏写。
+    return f"""请从文本中抽取事实，并以结构化 JSON 输出。要求：**极度详细**，宁可多写，不要漏写。
 
 {fact_types_instruction}
 
@@ -566,6 +832,32 @@ causal_relations（可选：因果链接，严禁乱写索引）
 ✅ 抽取：偏好（必须单独成事实）、情绪、计划、事件、关系、成就、重要背景
 ❌ 跳过：寒暄、感谢、口头禅、纯结构性/无信息量的语句（“谢谢”“好的”“明白了”）"""
 
+
+# The system prompt only depends on extract_opinions, so both variants are built once at import
+_PROMPT_WORLD_ASSISTANT = _build_extraction_prompt(extract_opinions=False)
+_PROMPT_OPINION = _build_extraction_prompt(extract_opinions=True)
+
+
+async def _extract_facts_from_chunk(
+    chunk: str,
+    chunk_index: int,
+    total_chunks: int,
+    event_date: datetime,
+    context: str,
+    llm_config: "LLMConfig",
+    agent_name: str = None,
+    extract_opinions: bool = False,
+) -> list[dict[str, str]]:
+    """
+    Extract facts from a single chunk (internal helper for parallel processing).
+
+    Note: event_date parameter is kept for backward compatibility but not used in prompt.
+    The LLM extracts temporal information from the context string instead.
+    """
+    memory_bank_context = f"\n- Your name: {agent_name}" if agent_name and extract_opinions else ""
+
+    prompt = _PROMPT_OPINION if extract_opinions else _PROMPT_WORLD_ASSISTANT
+
     import logging
 
     from openai import BadRequestError
@@ -581,33 +873,49 @@ causal_relations（可选：因果链接，严禁乱写索引）
     sanitized_context = _sanitize_text(context) if context else "none"
 
     # Build user message with metadata and chunk content in a clear format
-    # Format event_date with day of week for better temporal reasoning
-    weekday_cn = ["周一","周二","周三","周四","周五","周六","周日"][event_date.weekday()]
-    event_date_formatted = f"{event_date:%Y-%m-%d}（{weekday_cn}）"  # 例如："2024-06-10（周一）"
     user_message = f"""请从以下文本块中抽取事实。
 {memory_bank_context}
 
 分块：{chunk_index + 1}/{total_chunks}
-事件日期：{event_date_formatted}（{event_date.isoformat()}）
+事件日期：{_format_event_date(event_date)}
 上下文：{sanitized_context}
 
 文本：
 {sanitized_chunk}"""
 
+    # Identical content (e.g. re-ingested conversations) reuses a previous raw response
+    # The system prompt itself is part of the key, so prompt edits never serve stale responses
+    cache_size = _extraction_cache_size
+    cache_key = _extraction_cache_key(
+        llm_config.provider,
+        llm_config.model,
+        prompt,
+        agent_name or "",
+        event_date.isoformat(),
+        sanitized_context,
+        sanitized_chunk,
+    )
+
+    # Built once: every attempt sends the same messages, only the seed changes
+    messages = [{"role": "system", "content": prompt}, {"role": "user", "content": user_message}]
+
     for attempt in range(max_retries):
         try:
-            extraction_response_json = await llm_config.call(
-                messages=[{"role": "system", "content": prompt}, {"role": "user", "content": user_message}],
-                response_format=FactExtractionResponse,
-                scope="memory_extract_facts",
-                temperature=0.1,
-                max_completion_tokens=65000,
-                skip_validation=True,  # Get raw JSON, we'll validate leniently
-            )
-
-            # Lenient parsing of facts from raw JSON
-            chunk_facts = []
-            has_malformed_facts = False
+            extraction_response_json = _extraction_cache.get(cache_key) if attempt == 0 and cache_size else None
+            if extraction_response_json is not None:
+                _extraction_cache.move_to_end(cache_key)
+                logger.debug(f"          [1.3.{chunk_index + 1}] Reusing cached extraction response")
+            else:
+                extraction_response_json = await llm_config.call(
+                    messages=messages,
+                    response_format=FactExtractionResponse,
+                    scope="memory_extract_facts",
+                    temperature=0.1,
+                    max_completion_tokens=65000,
+                    max_retries=EXTRACTION_MAX_RETRIES,
+                    skip_validation=True,  # Get raw JSON, we'll validate leniently
+                    seed=EXTRACTION_RETRY_SEED + attempt,
+                )
 
             # Handle malformed LLM responses
             if not isinstance(extraction_response_json, dict):
@@ -615,6 +923,7 @@ causal_relations（可选：因果链接，严禁乱写索引）
                     logger.warning(
                         f"LLM returned non-dict JSON on attempt {attempt + 1}/{max_retries}: {type(extraction_response_json).__name__}. Retrying..."
                     )
+                    await asyncio.sleep(_extraction_retry_backoff(attempt))
                     continue
                 else:
                     logger.warning(
@@ -624,7 +933,8 @@ causal_relations（可选：因果链接，严禁乱写索引）
                     return []
 
             raw_facts = extraction_response_json.get("facts", [])
-            if not raw_facts:
+            if not raw_facts and logger.isEnabledFor(logging.DEBUG):
+                # Guarded: the message embeds the whole response and chunk text
                 logger.debug(
                     f"LLM response missing 'facts' field or returned empty list. "
                     f"Response: {extraction_response_json}. "
@@ -634,206 +944,76 @@ causal_relations（可选：因果链接，严禁乱写索引）
                     f"text: {chunk}"
                 )
 
-            for i, llm_fact in enumerate(raw_facts):
-                # Skip non-dict entries but track them for retry
-                if not isinstance(llm_fact, dict):
-                    logger.warning(f"Skipping non-dict fact at index {i}")
-                    has_malformed_facts = True
-                    continue
-
-                # Helper to get non-empty value
-                def get_value(field_name):
-                    value = llm_fact.get(field_name)
-                    if value and value != "" and value != [] and value != {} and str(value).upper() != "N/A":
-                        return value
-                    return None
-
-                # NEW FORMAT: what, when, who, why (all required)
-                what = get_value("what")
-                when = get_value("when")
-                who = get_value("who")
-                why = get_value("why")
-
-                # Fallback to old format if new fields not present
-                if not what:
-                    what = get_value("factual_core")
-                if not what:
-                    logger.warning(f"Skipping fact {i}: missing 'what' field")
-                    continue
-
-                # Critical field: fact_type
-                # LLM uses "assistant" but we convert to "experience" for storage
-                fact_type = llm_fact.get("fact_type")
-
-                # Convert "assistant" → "experience" for storage
-                if fact_type == "assistant":
-                    fact_type = "experience"
-
-                # Validate fact_type (after conversion)
-                if fact_type not in ["world", "experience", "opinion"]:
-                    # Try to fix common mistakes - check if they swapped fact_type and fact_kind
-                    fact_kind = llm_fact.get("fact_kind")
-                    if fact_kind == "assistant":
-                        fact_type = "experience"
-                    elif fact_kind in ["world", "experience", "opinion"]:
-                        fact_type = fact_kind
-                    else:
-                        # Default to 'world' if we can't determine
-                        fact_type = "world"
-                        logger.warning(f"Fact {i}: defaulting to fact_type='world'")
-
-                # Get fact_kind for temporal handling (but don't store it)
-                fact_kind = llm_fact.get("fact_kind", "conversation")
-                if fact_kind not in ["conversation", "event", "other"]:
-                    fact_kind = "conversation"
-
-                # Build combined fact text from the 4 dimensions: what | when | who | why
-                fact_data = {}
-                combined_parts = [what]
-
-                if when:
-                    combined_parts.append(f"时间：{when}")
-
-                if who:
-                    combined_parts.append(f"涉及：{who}")
-
-                if why:
-                    combined_parts.append(why)
-
-                combined_text = " | ".join(combined_parts)
-
-                # Add temporal fields
-                # For events: occurred_start/occurred_end (when the event happened)
-                if fact_kind == "event":
-                    occurred_start = get_value("occurred_start")
-                    occurred_end = get_value("occurred_end")
-
-                    # If LLM didn't set temporal fields, try to extract them from the fact text
-                    if not occurred_start:
-                        fact_data["occurred_start"] = _infer_temporal_date(combined_text, event_date)
-                    else:
-                        fact_data["occurred_start"] = occurred_start
-
-                    # For point events: if occurred_end not set, default to occurred_start
-                    if occurred_end:
-                        fact_data["occurred_end"] = occurred_end
-                    elif fact_data.get("occurred_start"):
-                        fact_data["occurred_end"] = fact_data["occurred_start"]
-
-                # Add entities if present (validate as Entity objects)
-                # LLM sometimes returns strings instead of {"text": "..."} format
-                entities = get_value("entities")
-                if entities:
-                    # Validate and normalize each entity
-                    validated_entities = []
-                    for ent in entities:
-                        if isinstance(ent, str):
-                            # Normalize string to Entity object
-                            validated_entities.append(Entity(text=ent))
-                        elif isinstance(ent, dict) and "text" in ent:
-                            try:
-                                validated_entities.append(Entity.model_validate(ent))
-                            except Exception as e:
-                                logger.warning(f"Invalid entity {ent}: {e}")
-                    if validated_entities:
-                        fact_data["entities"] = validated_entities
-
-                # Add causal relations if present (validate as CausalRelation objects)
-                # Filter out invalid relations:
-                # - must have required fields
-                # - target_fact_index must be within [0, len(raw_facts)-1]
-                # - only allow linking to earlier facts in this same LLM response (target_fact_index < i)
-                causal_relations = get_value("causal_relations")
-                if causal_relations:
-                    validated_relations = []
-                    max_idx = len(raw_facts) - 1  # raw_facts is the LLM's facts array for this chunk
-                    for rel in causal_relations:
-                        if not (isinstance(rel, dict) and "target_fact_index" in rel and "relation_type" in rel):
-                            continue
-                        try:
-                            rel_obj = CausalRelation.model_validate(rel)
-                        except Exception as e:
-                            logger.warning(f"Invalid causal relation {rel}: {e}")
-                            continue
-                
-                        t = rel_obj.target_fact_index
-                        if not isinstance(t, int) or t < 0 or t > max_idx or t >= i:
-                            # Drop silently; we also sanitize later after compaction.
-                            logger.debug(
-                                f"Dropped causal relation with invalid/forward target_fact_index={t} "
-                                f"(fact_index={i}, max_idx={max_idx})"
-                            )
-                            continue
-                
-                        validated_relations.append(rel_obj)
-                
-                    if validated_relations:
-                        fact_data["causal_relations"] = validated_relations
-
-                # Always set mentioned_at to the event_date (when the conversation/document occurred)
-                fact_data["mentioned_at"] = event_date.isoformat()
-
-                # Build Fact model instance
-                try:
-                    fact = Fact(fact=combined_text, fact_type=fact_type, **fact_data)
-                    chunk_facts.append(fact)
-                except Exception as e:
-                    logger.error(f"Failed to create Fact model for fact {i}: {e}")
-                    has_malformed_facts = True
-                    continue
+            # Lenient parsing of facts from raw JSON. Validation is CPU-bound (pydantic, regex
+            # inference); run it off the event loop so other chunks' LLM requests keep progressing
+            chunk_facts, has_malformed_facts = await asyncio.to_thread(_build_facts_from_raw, raw_facts, event_date)
 
             # If we got malformed facts and haven't exhausted retries, try again
             if has_malformed_facts and len(chunk_facts) < len(raw_facts) * 0.8 and attempt < max_retries - 1:
                 logger.warning(
                     f"Got {len(raw_facts) - len(chunk_facts)} malformed facts out of {len(raw_facts)} on attempt {attempt + 1}/{max_retries}. Retrying..."
                 )
+                await asyncio.sleep(_extraction_retry_backoff(attempt))
                 continue
+
+            if cache_size and not has_malformed_facts:
+                _extraction_cache[cache_key] = extraction_response_json
+                while len(_extraction_cache) > cache_size:
+                    _extraction_cache.popitem(last=False)
+
             # Sanitize causal_relations to match the final (compacted) chunk_facts list.
             # The LLM may reference indices from the raw list (or use 1-based indices). After we drop malformed
             # facts, indices can drift; link_utils would otherwise warn and drop them later.
-            debug_causal = False
-            try:
-                debug_causal = os.getenv("HINDSIGHT_DEBUG_CAUSAL", "0") == "1"
-            except Exception:
-                debug_causal = False
+            debug_causal = os.getenv("HINDSIGHT_DEBUG_CAUSAL", "0") == "1"
 
             if chunk_facts:
-                # Gather stats before cleaning
+                # Gather stats before cleaning (and remember which facts have relations, so the
+                # cleaning pass below only visits those). The per-relation loop only tracks what
+                # the cleaning needs; debug-only examples are collected per fact, and only when
+                # HINDSIGHT_DEBUG_CAUSAL is on
                 total_rels_before = 0
-                all_targets: list[int] = []
+                # Running bounds of the integer targets (all that 1-based detection needs)
+                tgt_min: int | None = None
+                tgt_max: int | None = None
                 example_rels: list[str] = []
+                facts_with_rels: list[tuple[int, Fact, list]] = []
+                # Whether any relation fails the (0-based) checks of the cleaning pass below
+                needs_cleaning = False
                 for _j, _f in enumerate(chunk_facts):
-                    _rels = getattr(_f, "causal_relations", None)
+                    _rels = _f.causal_relations
                     if not _rels:
                         continue
+                    facts_with_rels.append((_j, _f, _rels))
+                    total_rels_before += len(_rels)
+                    if debug_causal and len(example_rels) < 5:
+                        example_rels.extend(
+                            f"fact={_j} -> target={_r.target_fact_index} type={_r.relation_type}"
+                            for _r in _rels[: 5 - len(example_rels)]
+                        )
                     for _r in _rels:
-                        total_rels_before += 1
-                        _t = getattr(_r, "target_fact_index", None)
-                        _rt = getattr(_r, "relation_type", None)
+                        _t = _r.target_fact_index
                         if isinstance(_t, int):
-                            all_targets.append(_t)
-                        if debug_causal and len(example_rels) < 5:
-                            example_rels.append(f"fact={_j} -> target={_t} type={_rt}")
-
-                # Detect common 1-based indexing pattern
-                one_based = False
-                if all_targets:
-                    try:
-                        if 0 not in all_targets and min(all_targets) >= 1 and max(all_targets) == len(chunk_facts):
-                            one_based = True
-                    except Exception:
-                        one_based = False
+                            if tgt_min is None:
+                                tgt_min = tgt_max = _t
+                            elif _t < tgt_min:
+                                tgt_min = _t
+                            elif _t > tgt_max:
+                                tgt_max = _t
+                        if not isinstance(_t, int) or _t < 0 or _t >= _j:
+                            needs_cleaning = True
+
+                # Detect common 1-based indexing pattern (a minimum of at least 1 also rules out 0)
+                num_facts = len(chunk_facts)
+                one_based = tgt_min is not None and tgt_min >= 1 and tgt_max == num_facts
 
                 if debug_causal:
                     if total_rels_before == 0:
                         logger.info(
-                            f"[CAUSAL_DEBUG] chunk_facts={len(chunk_facts)}; no causal_relations produced by LLM"
+                            f"[CAUSAL_DEBUG] chunk_facts={num_facts}; no causal_relations produced by LLM"
                         )
                     else:
-                        tgt_min = min(all_targets) if all_targets else None
-                        tgt_max = max(all_targets) if all_targets else None
                         logger.info(
-                            f"[CAUSAL_DEBUG] chunk_facts={len(chunk_facts)}; causal_relations_before={total_rels_before}; "
+                            f"[CAUSAL_DEBUG] chunk_facts={num_facts}; causal_relations_before={total_rels_before}; "
                             f"targets_min={tgt_min} targets_max={tgt_max} one_based={one_based}"
                         )
                         if example_rels:
@@ -845,33 +1025,37 @@ causal_relations（可选：因果链接，严禁乱写索引）
                 dropped_forward_or_self = 0
                 kept = 0
 
-                for j, f in enumerate(chunk_facts):
-                    rels = getattr(f, "causal_relations", None)
-                    if not rels:
-                        continue
-                    cleaned = []
-                    for rel in rels:
-                        t = getattr(rel, "target_fact_index", None)
-                        if one_based and isinstance(t, int):
-                            t = t - 1
-                            rel = rel.model_copy(update={"target_fact_index": t})
-
-                        if not isinstance(t, int):
-                            dropped_non_int += 1
-                            continue
-                        if t < 0 or t >= len(chunk_facts):
-                            dropped_oob += 1
-                            continue
-                        # Keep only backward links (target must be an earlier fact index); drop self/forward
-                        if t >= j:
-                            dropped_forward_or_self += 1
-                            continue
-
-                        cleaned.append(rel)
-                        kept += 1
-
-                    if cleaned != rels:
-                        chunk_facts[j] = f.model_copy(update={"causal_relations": cleaned})
+                if not (one_based or needs_cleaning):
+                    # Every relation already points at an earlier fact, nothing to rewrite or drop
+                    kept = total_rels_before
+                else:
+                    # The facts and relations were built in this call and are not shared, so they are
+                    # fixed up in place instead of through model_copy()
+                    for j, f, rels in facts_with_rels:
+                        cleaned = []
+                        for rel in rels:
+                            t = rel.target_fact_index
+                            if one_based and isinstance(t, int):
+                                t = t - 1
+                                rel.target_fact_index = t
+
+                            if not isinstance(t, int):
+                                dropped_non_int += 1
+                                continue
+                            if t < 0 or t >= num_facts:
+                                dropped_oob += 1
+                                continue
+                            # Keep only backward links (target must be an earlier fact index); drop self/forward
+                            if t >= j:
+                                dropped_forward_or_self += 1
+                                continue
+
+                            cleaned.append(rel)
+                            kept += 1
+
+                        # cleaned is a subsequence of rels, so only a length change means drops
+                        if len(cleaned) != len(rels):
+                            f.causal_relations = cleaned
 
                 if debug_causal and total_rels_before > 0:
                     logger.info(
@@ -889,6 +1073,7 @@ causal_relations（可选：因果链接，严禁乱写索引）
                 )
                 if attempt < max_retries - 1:
                     logger.info(f"          [1.3.{chunk_index + 1}] Retrying...")
+                    await asyncio.sleep(_extraction_retry_backoff(attempt))
                     continue
             # If it's not a JSON validation error or we're out of retries, re-raise
             raise
@@ -897,6 +1082,23 @@ causal_relations（可选：因果链接，严禁乱写索引）
     raise last_error
 
 
+async def _gather_chunks(coros: list) -> list:
+    """
+    Run per-chunk extractions concurrently, failing fast.
+
+    Concurrency against the provider is already bounded by the global LLM semaphore in
+    llm_wrapper. If one chunk fails, the remaining chunks are cancelled instead of being
+    left to finish LLM calls whose results would be discarded with the error.
+    """
+    tasks = [asyncio.ensure_future(coro) for coro in coros]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
 async def _extract_facts_with_auto_split(
     chunk: str,
     chunk_index: int,
@@ -910,8 +1112,9 @@ async def _extract_facts_with_auto_split(
     """
     Extract facts from a chunk with automatic splitting if output exceeds token limits.
 
-    If the LLM output is too long (OutputTooLongError), this function automatically
-    splits the chunk in half and processes each half recursively.
+    If the LLM output is too long (OutputTooLongError), or the request keeps timing out
+    (LLMTimeoutError) on a chunk of at least MIN_TIMEOUT_SPLIT_CHARS, this function
+    automatically splits the chunk in half and processes each half recursively.
 
     Args:
         chunk: Text chunk to process
@@ -942,10 +1145,16 @@ async def _extract_facts_with_auto_split(
             agent_name=agent_name,
             extract_opinions=extract_opinions,
         )
-    except OutputTooLongError:
-        # Output exceeded token limits - split the chunk in half and retry
+    except (OutputTooLongError, LLMTimeoutError) as e:
+        # A timeout on an already small chunk is not caused by its size (e.g. a provider
+        # outage); halving it further would only multiply the failing requests
+        if isinstance(e, LLMTimeoutError) and len(chunk) < MIN_TIMEOUT_SPLIT_CHARS:
+            raise
+
+        # Output exceeded token limits (or took too long) - split the chunk in half and retry
+        reason = "Output too long" if isinstance(e, OutputTooLongError) else "LLM request timed out"
         logger.warning(
-            f"Output too long for chunk {chunk_index + 1}/{total_chunks} "
+            f"{reason} for chunk {chunk_index + 1}/{total_chunks} "
             f"({len(chunk)} chars). Splitting in half and retrying..."
         )
 
@@ -953,19 +1162,15 @@ async def _extract_facts_with_auto_split(
         mid_point = len(chunk) // 2
 
         # Try to find a sentence boundary near the midpoint
-        # Look for ". ", "! ", "? " within 20% of midpoint
+        # Look for ". ", "! ", "? " or a paragraph break within 20% of midpoint, taking the
+        # last one in a single scan of the window
         search_range = int(len(chunk) * 0.2)
         search_start = max(0, mid_point - search_range)
         search_end = min(len(chunk), mid_point + search_range)
 
-        sentence_endings = [". ", "! ", "? ", "\n\n"]
         best_split = mid_point
-
-        for ending in sentence_endings:
-            pos = chunk.rfind(ending, search_start, search_end)
-            if pos != -1:
-                best_split = pos + len(ending)
-                break
+        for match in _SPLIT_BOUNDARY_RE.finditer(chunk, search_start, search_end):
+            best_split = match.end()
 
         # Split the chunk
         first_half = chunk[:best_split].strip()
@@ -999,7 +1204,7 @@ async def _extract_facts_with_auto_split(
             ),
         ]
 
-        sub_results = await asyncio.gather(*sub_tasks)
+        sub_results = await _gather_chunks(sub_tasks)
 
         # Combine results from both halves
         all_facts = []
@@ -1055,7 +1260,7 @@ async def extract_facts_from_text(
         )
         for i, chunk in enumerate(chunks)
     ]
-    chunk_results = await asyncio.gather(*tasks)
+    chunk_results = await _gather_chunks(tasks)
     all_facts = []
     chunk_metadata = []  # [(chunk_text, fact_count), ...]
     for chunk, chunk_facts in zip(chunks, chunk_results):
@@ -1080,6 +1285,12 @@ logger = logging.getLogger(__name__)
 SECONDS_PER_FACT = 10
 
 
+@functools.lru_cache(maxsize=1024)
+def _fact_time_offset(fact_position: int) -> timedelta:
+    """Get the (shared, immutable) time offset for the n-th fact of a content."""
+    return timedelta(seconds=fact_position * SECONDS_PER_FACT)
+
+
 async def extract_facts_from_contents(
     contents: list[RetainContent], llm_config, agent_name: str, extract_opinions: bool = False
 ) -> tuple[list[ExtractedFactType], list[ChunkMetadata]]:
@@ -1122,7 +1333,20 @@ async def extract_facts_from_contents(
     # Step 2: Wait for all fact extractions to complete
     all_fact_results = await asyncio.gather(*fact_extraction_tasks)
 
-    # Step 3: Flatten and convert to typed objects
+    # Step 3: Flatten and convert to typed objects, with time offsets. This is CPU-bound
+    # (datetime parsing, object construction for every fact), so it runs off the event loop
+    return await asyncio.to_thread(_convert_extraction_results, contents, all_fact_results)
+
+
+def _convert_extraction_results(
+    contents: list[RetainContent], all_fact_results: list[tuple[list[Fact], list[tuple[str, int]]]]
+) -> tuple[list[ExtractedFactType], list[ChunkMetadata]]:
+    """
+    Convert per-content extraction results into ExtractedFact and ChunkMetadata objects.
+
+    Indexes chunks and facts globally across contents, and adds time offsets to preserve
+    fact ordering within each content.
+    """
     extracted_facts: list[ExtractedFactType] = []
     chunks_metadata: list[ChunkMetadata] = []
 
@@ -1130,58 +1354,54 @@ async def extract_facts_from_contents(
     global_fact_idx = 0
 
     for content_index, (content, (facts_from_llm, chunks_from_llm)) in enumerate(zip(contents, all_fact_results)):
-        chunk_start_idx = global_chunk_idx
-
-        # Convert chunk tuples to ChunkMetadata objects
-        for chunk_index_in_content, (chunk_text, chunk_fact_count) in enumerate(chunks_from_llm):
-            chunk_metadata = ChunkMetadata(
-                chunk_text=chunk_text,
-                fact_count=chunk_fact_count,
-                content_index=content_index,
-                chunk_index=global_chunk_idx,
-            )
-            chunks_metadata.append(chunk_metadata)
-            global_chunk_idx += 1
+        # Same for every fact of this content
+        context = content.context
+        event_date = content.event_date
+        metadata = content.metadata
 
-        # Convert facts to ExtractedFact objects with proper indexing
+        # One pass per chunk: record its ChunkMetadata and convert its slice of the facts
         fact_idx_in_content = 0
-        for chunk_idx_in_content, (chunk_text, chunk_fact_count) in enumerate(chunks_from_llm):
-            chunk_global_idx = chunk_start_idx + chunk_idx_in_content
-            chunk_fact_start_global_idx = global_fact_idx 
-
-            for _ in range(chunk_fact_count):
-                if fact_idx_in_content < len(facts_from_llm):
-                    fact_from_llm = facts_from_llm[fact_idx_in_content]
-
-                    # Convert Fact model from LLM to ExtractedFactType dataclass
-                    # mentioned_at is always the event_date (when the conversation/document occurred)
-                    extracted_fact = ExtractedFactType(
-                        fact_text=fact_from_llm.fact,
-                        fact_type=fact_from_llm.fact_type,
-                        entities=[e.text for e in (fact_from_llm.entities or [])],
-                        # occurred_start/end: from LLM only, leave None if not provided
-                        occurred_start=_parse_datetime(fact_from_llm.occurred_start)
-                        if fact_from_llm.occurred_start
-                        else None,
-                        occurred_end=_parse_datetime(fact_from_llm.occurred_end)
-                        if fact_from_llm.occurred_end
-                        else None,
-                        causal_relations=_convert_causal_relations(
-                            fact_from_llm.causal_relations or [], chunk_fact_start_global_idx
-                        ),
-                        content_index=content_index,
-                        chunk_index=chunk_global_idx,
-                        context=content.context,
-                        # mentioned_at: always the event_date (when the conversation/document occurred)
-                        mentioned_at=content.event_date,
-                        metadata=content.metadata,
-                    )
+        for chunk_text, chunk_fact_count in chunks_from_llm:
+            chunks_metadata.append(
+                ChunkMetadata(
+                    chunk_text=chunk_text,
+                    fact_count=chunk_fact_count,
+                    content_index=content_index,
+                    chunk_index=global_chunk_idx,
+                )
+            )
+
+            chunk_fact_start_global_idx = global_fact_idx
+            chunk_facts = facts_from_llm[fact_idx_in_content : fact_idx_in_content + chunk_fact_count]
+            for fact_from_llm in chunk_facts:
+                # Convert Fact model from LLM to ExtractedFactType dataclass
+                # mentioned_at is always the event_date (when the conversation/document occurred)
+                extracted_fact = ExtractedFactType(
+                    fact_text=fact_from_llm.fact,
+                    fact_type=fact_from_llm.fact_type,
+                    entities=[e.text for e in (fact_from_llm.entities or [])],
+                    # occurred_start/end: from LLM only, leave None if not provided
+                    occurred_start=_parse_datetime(fact_from_llm.occurred_start)
+                    if fact_from_llm.occurred_start
+                    else None,
+                    occurred_end=_parse_datetime(fact_from_llm.occurred_end) if fact_from_llm.occurred_end else None,
+                    causal_relations=_convert_causal_relations(
+                        fact_from_llm.causal_relations or [], chunk_fact_start_global_idx
+                    ),
+                    content_index=content_index,
+                    chunk_index=global_chunk_idx,
+                    context=context,
+                    # mentioned_at: always the event_date (when the conversation/document occurred)
+                    mentioned_at=event_date,
+                    metadata=metadata,
+                )
+                extracted_facts.append(extracted_fact)
 
-                    extracted_facts.append(extracted_fact)
-                    global_fact_idx += 1
-                    fact_idx_in_content += 1
+            global_fact_idx += len(chunk_facts)
+            fact_idx_in_content += len(chunk_facts)
+            global_chunk_idx += 1
 
-    # Step 4: Add time offsets to preserve ordering within each content
+    # Add time offsets to preserve ordering within each content
     _add_temporal_offsets(extracted_facts, contents)
 
     return extracted_facts, chunks_metadata
@@ -1189,8 +1409,12 @@ async def extract_facts_from_contents(
 
 def _parse_datetime(date_str: str):
     """Parse ISO datetime string."""
-    from dateutil import parser as date_parser
-
+    # datetime.fromisoformat (C, and ISO 8601 incl. "Z" since Python 3.11) handles what the
+    # LLM normally returns; dateutil's slower pure-Python parser only sees the odd variants
+    try:
+        return datetime.fromisoformat(date_str)
+    except ValueError:
+        pass
     try:
         return date_parser.isoparse(date_str)
     except Exception:
@@ -1223,24 +1447,24 @@ def _add_temporal_offsets(facts: list[ExtractedFactType], contents: list[RetainC
 
     Modifies facts in place.
     """
-    # Group facts by content_index
-    current_content_idx = 0
-    content_fact_start = 0
-
-    for i, fact in enumerate(facts):
-        if fact.content_index != current_content_idx:
-            # Moved to next content
-            current_content_idx = fact.content_index
-            content_fact_start = i
-
-        # Calculate position within this content
-        fact_position = i - content_fact_start
-        offset = timedelta(seconds=fact_position * SECONDS_PER_FACT)
-
-        # Apply offset to all temporal fields
-        if fact.occurred_start:
-            fact.occurred_start = fact.occurred_start + offset
-        if fact.occurred_end:
-            fact.occurred_end = fact.occurred_end + offset
-        if fact.mentioned_at:
-            fact.mentioned_at = fact.mentioned_at + offset
+    # Only facts after the first of their content get an offset (chat messages often
+    # yield a single fact)
+    if len(facts) < 2:
+        return
+
+    # Facts of one content are contiguous, so group them by content_index and use
+    # the position within the group
+    for _, content_facts in groupby(facts, key=attrgetter("content_index")):
+        for fact_position, fact in enumerate(content_facts):
+            if not fact_position:
+                # The first fact of each content keeps its timestamps
+                continue
+            offset = _fact_time_offset(fact_position)
+
+            # Apply offset to all temporal fields
+            if fact.occurred_start:
+                fact.occurred_start = fact.occurred_start + offset
+            if fact.occurred_end:
+                fact.occurred_end = fact.occurred_end + offset
+            if fact.mentioned_at:
+                fact.mentioned_at = fact.mentioned_at + offset
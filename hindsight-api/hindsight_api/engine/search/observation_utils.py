@@ -5,14 +5,27 @@ Observations are objective facts synthesized from multiple memory facts
 about an entity, without personality influence.
 """
 
+import hashlib
 import logging
+from collections import OrderedDict
 
+import orjson
 from pydantic import BaseModel, Field
 
 from ..response_models import MemoryFact
 
 logger = logging.getLogger(__name__)
 
+# 3-7 short observations fit well within this; bounding it (and the retries) keeps one
+# slow entity from stalling the observation pass, whose failures are non-fatal anyway
+OBSERVATION_MAX_COMPLETION_TOKENS = 4096
+OBSERVATION_MAX_RETRIES = 3
+
+# LRU of observations by (model, entity, facts): regenerating an entity whose facts have
+# not changed since the last run returns the previous observations without an LLM call
+_OBSERVATION_CACHE_MAXSIZE = 256
+_observation_cache: OrderedDict[str, list[str]] = OrderedDict()
+
 
 class Observation(BaseModel):
     """An observation about an entity."""
@@ -28,8 +41,6 @@ class ObservationExtractionResponse(BaseModel):
 
 def format_facts_for_observation_prompt(facts: list[MemoryFact]) -> str:
     """Format facts as text for observation extraction prompt."""
-    import json
-
     if not facts:
         return "[]"
     formatted = []
@@ -46,23 +57,20 @@ def format_facts_for_observation_prompt(facts: list[MemoryFact]) -> str:
 
         formatted.append(fact_obj)
 
-    return json.dumps(formatted, indent=2)
+    # orjson writes non-ASCII text as-is, so Chinese facts reach the LLM as characters
+    # rather than \uXXXX escapes (also far fewer prompt tokens)
+    return orjson.dumps(formatted, option=orjson.OPT_INDENT_2).decode()
 
 
-def build_observation_prompt(
-    entity_name: str,
-    facts_text: str,
-) -> str:
-    """Build the observation extraction prompt for the LLM."""
-    return f"""请根据以下关于「{entity_name}」的事实，生成一组关键“观察结论”。
-
-关于 {entity_name.upper()} 的事实：
-{facts_text}
+# Everything that does not depend on the entity lives in the system message, so every
+# observation call starts with the same bytes and the providers' prompt prefix caching
+# (automatic on OpenAI, cache_control on Anthropic) applies across entities.
+_OBSERVATION_SYSTEM_MESSAGE = """你是一名客观观察者，负责综合关于某个实体的事实，生成清晰、可核对的观察结论。不要输出观点/评价/推测，不要带人格色彩。请用简体中文输出，保持简洁准确。专有名词（人名/组织名/产品名等）保持原文不翻译。
 
-你的任务：把这些事实综合成清晰、客观、可核对的观察结论（关于 {entity_name} 的事实性陈述）。
+你的任务：把用户给出的事实综合成清晰、客观、可核对的观察结论（关于该实体的事实性陈述）。
 
 指南：
-1. 每条 observation 都必须是关于 {entity_name} 的**事实性陈述**
+1. 每条 observation 都必须是关于该实体的**事实性陈述**
 2. 适当把相关事实合并成一条更完整的 observation
 3. 必须客观：不要加入观点、价值判断、情绪化措辞、推测或心理揣测
 4. 只写“我们知道什么”，不要写“我们猜测什么”
@@ -87,9 +95,20 @@ def build_observation_prompt(
 请根据事实生成 3-7 条 observation。如果事实很少，可以生成更少条；不要为了凑数量而编造。"""
 
 
+def build_observation_prompt(
+    entity_name: str,
+    facts_text: str,
+) -> str:
+    """Build the observation extraction prompt for the LLM (only the entity-specific part)."""
+    return f"""请根据以下关于「{entity_name}」的事实，生成一组关键“观察结论”。
+
+关于 {entity_name.upper()} 的事实：
+{facts_text}"""
+
+
 def get_observation_system_message() -> str:
     """Get the system message for observation extraction."""
-    return "你是一名客观观察者，负责综合关于某个实体的事实，生成清晰、可核对的观察结论。不要输出观点/评价/推测，不要带人格色彩。请用简体中文输出，保持简洁准确。专有名词（人名/组织名/产品名等）保持原文不翻译。"
+    return _OBSERVATION_SYSTEM_MESSAGE
 
 
 async def extract_observations_from_facts(llm_config, entity_name: str, facts: list[MemoryFact]) -> list[str]:
@@ -110,6 +129,14 @@ async def extract_observations_from_facts(llm_config, entity_name: str, facts: l
     facts_text = format_facts_for_observation_prompt(facts)
     prompt = build_observation_prompt(entity_name, facts_text)
 
+    cache_key = hashlib.blake2b(
+        "\x00".join((llm_config.provider, llm_config.model, prompt)).encode(), digest_size=16
+    ).hexdigest()
+    cached = _observation_cache.get(cache_key)
+    if cached is not None:
+        _observation_cache.move_to_end(cache_key)
+        return list(cached)
+
     try:
         result = await llm_config.call(
             messages=[
@@ -118,10 +145,16 @@ async def extract_observations_from_facts(llm_config, entity_name: str, facts: l
             ],
             response_format=ObservationExtractionResponse,
             scope="memory_extract_observation",
+            max_completion_tokens=OBSERVATION_MAX_COMPLETION_TOKENS,
+            max_retries=OBSERVATION_MAX_RETRIES,
         )
 
         observations = [op.observation for op in result.observations]
-        return observations
+        if observations:
+            _observation_cache[cache_key] = observations
+            if len(_observation_cache) > _OBSERVATION_CACHE_MAXSIZE:
+                _observation_cache.popitem(last=False)
+        return list(observations)
 
     except Exception as e:
         logger.warning(f"Failed to extract observations for {entity_name}: {str(e)}")
@@ -2,16 +2,85 @@
 Think operation utilities for formulating answers based on agent and world facts.
 """
 
+import asyncio
+import functools
 import logging
 import re
+import time
+from collections.abc import AsyncIterator
 from datetime import datetime
+from typing import NamedTuple
 
+import orjson
 from pydantic import BaseModel, Field
 
 from ..response_models import DispositionTraits, MemoryFact
 
 logger = logging.getLogger(__name__)
 
+# Third-person opinion phrasings rewritten to first person in extract_opinions_from_text
+# 中文第三人称模式："说话者/用户/他们 认为..." -> "我认为..."
+_CN_THIRD_PERSON_RE = re.compile(
+    r"^(说话者|用户|对方|回答者|他们|她们|他|她)\s*(认为|觉得|相信|感觉|说|表示|主张|指出|提到|强调)(\s*：|\s*是|\s*说|\s*认为|\s*觉得|\s*相信)?(.*)$"
+)
+# Pattern: "The speaker/user [verb]..." -> "I [verb]..."
+_EN_THIRD_PERSON_RE = re.compile(
+    r"^(The speaker|The user|They|It is believed) (believes?|thinks?|feels?|says|asserts?|considers?)(\s+that)?(.*)$",
+    re.IGNORECASE,
+)
+
+# Opinions not starting with one of these get "我认为：" prepended (a tuple, for str.startswith)
+_FIRST_PERSON_STARTERS = (
+    "我认为",
+    "我相信",
+    "我觉得",
+    "在我看来",
+    "我逐渐相信",
+    "以前我",
+    # 兼容少量英文输出（兜底）
+    "I think",
+    "I believe",
+    "I feel",
+    "In my view",
+    "I've come to believe",
+    "Previously I",
+)
+
+
+def _singularize_verb(verb: str) -> str:
+    """Turn a third-person verb into its first-person form (believes -> believe)."""
+    if verb.endswith("es"):
+        return verb[:-1]  # believes -> believe
+    elif verb.endswith("s"):
+        return verb[:-1]  # thinks -> think
+    return verb
+
+
+def _to_first_person(opinion_text: str) -> str:
+    """Rewrite an extracted opinion into a first-person statement if it isn't one already."""
+    # Replace common third-person patterns with first-person
+    # 中文第三人称模式："说话者/用户/他们 认为..." -> "我认为..."
+    cn_match = _CN_THIRD_PERSON_RE.match(opinion_text.strip())
+    if cn_match:
+        # 统一改写为第一人称
+        rest = cn_match.group(4).lstrip()
+        # 如果 rest 已经以“我”开头则不重复；否则尽量保留原句结构
+        opinion_text = rest if rest.startswith("我") else f"我{cn_match.group(2)}{rest}"
+
+    # Pattern: "The speaker/user [verb]..." -> "I [verb]..."
+    match = _EN_THIRD_PERSON_RE.match(opinion_text)
+    if match:
+        verb = _singularize_verb(match.group(2))
+        that_part = match.group(3) or ""  # Keep " that" if present
+        rest = match.group(4)
+        opinion_text = f"I {verb}{that_part}{rest}"
+
+    # If still doesn't start with first-person, prepend "I believe that "
+    if not opinion_text.startswith(_FIRST_PERSON_STARTERS):
+        opinion_text = "我认为" + (opinion_text if opinion_text.startswith(("：", ":")) else "：" + opinion_text)
+
+    return opinion_text
+
 
 class Opinion(BaseModel):
     """An opinion formed by the bank."""
@@ -28,69 +97,127 @@ class OpinionExtractionResponse(BaseModel):
     )
 
 
+# Per-trait descriptions indexed by trait value - 1 (values are 1-5)
+_TRAIT_LEVELS = ("很低", "较低", "中等", "较高", "很高")
+
+_SKEPTICISM_DESC = (
+    "你非常容易信任信息，倾向于直接按字面接受。",
+    "你通常会信任信息，但会对明显矛盾之处产生疑问。",
+    "你在信任与怀疑之间保持平衡，不会过度轻信也不会过度怀疑。",
+    "你比较怀疑，常常会质疑信息的可靠性与潜在问题。",
+    "你高度怀疑，会严格审视信息的准确性、动机与隐藏风险。",
+)
+
+_LITERALISM_DESC = (
+    "你会非常灵活地理解信息，善于读懂弦外之音并推断真实意图。",
+    "你会同时考虑语境与暗示意义，而不仅仅是字面含义。",
+    "你会在字面理解与语境理解之间取得平衡。",
+    "你更偏向字面理解，强调精确措辞与明确承诺。",
+    "你极度字面化，重点关注逐字含义与严格的措辞边界。",
+)
+
+_EMPATHY_DESC = (
+    "你主要关注事实与结果，会把情绪背景放在次要位置。",
+    "你会先看事实，但也承认情绪因素可能存在。",
+    "你会在理性分析与情绪理解之间保持平衡。",
+    "你会显著重视情绪背景与人类因素。",
+    "你会强烈考虑他人的情绪状态与处境，再形成记忆与观点。",
+)
+
+
+def _trait_entry(table: tuple[str, ...], value: int) -> str:
+    """Look up the entry for a trait value, falling back to the neutral (3) one out of range."""
+    return table[value - 1] if 1 <= value <= 5 else table[2]
+
+
 def describe_trait_level(value: int) -> str:
     """Convert trait value (1-5) to descriptive text."""
-    levels = {1: "很低", 2: "较低", 3: "中等", 4: "较高", 5: "很高"}
-    return levels.get(value, "中等")
+    return _trait_entry(_TRAIT_LEVELS, value)
+
+
+class _DispositionKey(NamedTuple):
+    """Plain, hashable copy of DispositionTraits used to key the cached prompt builders."""
+
+    skepticism: int
+    literalism: int
+    empathy: int
+
+
+def _disposition_key(disposition: DispositionTraits) -> _DispositionKey:
+    """Convert disposition traits to their cache key (once, at the public function boundary)."""
+    return _DispositionKey(disposition.skepticism, disposition.literalism, disposition.empathy)
 
 
 def build_disposition_description(disposition: DispositionTraits) -> str:
     """Build a disposition description string from disposition traits."""
-    skepticism_desc = {
-        1: "你非常容易信任信息，倾向于直接按字面接受。",
-        2: "你通常会信任信息，但会对明显矛盾之处产生疑问。",
-        3: "你在信任与怀疑之间保持平衡，不会过度轻信也不会过度怀疑。",
-        4: "你比较怀疑，常常会质疑信息的可靠性与潜在问题。",
-        5: "你高度怀疑，会严格审视信息的准确性、动机与隐藏风险。",
-    }
-
-    literalism_desc = {
-        1: "你会非常灵活地理解信息，善于读懂弦外之音并推断真实意图。",
-        2: "你会同时考虑语境与暗示意义，而不仅仅是字面含义。",
-        3: "你会在字面理解与语境理解之间取得平衡。",
-        4: "你更偏向字面理解，强调精确措辞与明确承诺。",
-        5: "你极度字面化，重点关注逐字含义与严格的措辞边界。",
-    }
-
-    empathy_desc = {
-        1: "你主要关注事实与结果，会把情绪背景放在次要位置。",
-        2: "你会先看事实，但也承认情绪因素可能存在。",
-        3: "你会在理性分析与情绪理解之间保持平衡。",
-        4: "你会显著重视情绪背景与人类因素。",
-        5: "你会强烈考虑他人的情绪状态与处境，再形成记忆与观点。",
-    }
+    return _build_disposition_description_cached(_disposition_key(disposition))
 
+
+@functools.lru_cache(maxsize=128)
+def _build_disposition_description_cached(key: _DispositionKey) -> str:
+    """Build the disposition description for a trait triple."""
+    skepticism, literalism, empathy = key
     return f"""你的性格倾向（disposition traits）：
-- 怀疑倾向（Skepticism） ({describe_trait_level(disposition.skepticism)}): {skepticism_desc.get(disposition.skepticism, skepticism_desc[3])}
-- 字面倾向（Literalism） ({describe_trait_level(disposition.literalism)}): {literalism_desc.get(disposition.literalism, literalism_desc[3])}
-- 共情倾向（Empathy） ({describe_trait_level(disposition.empathy)}): {empathy_desc.get(disposition.empathy, empathy_desc[3])}"""
+- 怀疑倾向（Skepticism） ({describe_trait_level(skepticism)}): {_trait_entry(_SKEPTICISM_DESC, skepticism)}
+- 字面倾向（Literalism） ({describe_trait_level(literalism)}): {_trait_entry(_LITERALISM_DESC, literalism)}
+- 共情倾向（Empathy） ({describe_trait_level(empathy)}): {_trait_entry(_EMPATHY_DESC, empathy)}"""
 
 
-def format_facts_for_prompt(facts: list[MemoryFact]) -> str:
-    """Format facts as JSON for LLM prompt."""
-    import json
+def _fact_prompt_obj(fact: MemoryFact) -> dict:
+    """Build the JSON object for one fact in the think prompt."""
+    fact_obj = {"text": fact.text}
 
-    if not facts:
-        return "[]"
-    formatted = []
-    for fact in facts:
-        fact_obj = {"text": fact.text}
+    # Add context if available
+    if fact.context:
+        fact_obj["context"] = fact.context
 
-        # Add context if available
-        if fact.context:
-            fact_obj["context"] = fact.context
+    # Add occurred_start if available (when the fact occurred)
+    occurred_start = fact.occurred_start
+    if occurred_start:
+        if isinstance(occurred_start, str):
+            fact_obj["occurred_start"] = occurred_start
+        elif isinstance(occurred_start, datetime):
+            fact_obj["occurred_start"] = occurred_start.strftime("%Y-%m-%d %H:%M:%S")
 
-        # Add occurred_start if available (when the fact occurred)
-        if fact.occurred_start:
-            occurred_start = fact.occurred_start
-            if isinstance(occurred_start, str):
-                fact_obj["occurred_start"] = occurred_start
-            elif isinstance(occurred_start, datetime):
-                fact_obj["occurred_start"] = occurred_start.strftime("%Y-%m-%d %H:%M:%S")
+    return fact_obj
 
-        formatted.append(fact_obj)
 
-    return json.dumps(formatted, indent=2)
+def format_facts_for_prompt(facts: list[MemoryFact]) -> str:
+    """Format facts as JSON for LLM prompt."""
+    if not facts:
+        return "[]"
+    # One comprehension sizes the list up front instead of growing it per append
+    formatted = [_fact_prompt_obj(fact) for fact in facts]
+
+    # Same layout as json.dumps(indent=2), but from C and with non-ASCII (Chinese) text
+    # written as-is rather than \uXXXX escapes, which also saves prompt tokens
+    return orjson.dumps(formatted, option=orjson.OPT_INDENT_2).decode()
+
+
+# Static segments of the think prompt (including the optional section headings);
+# build_think_prompt joins them with the dynamic values in a single str.join
+_THINK_PROMPT_HEADER = "以下是我所知道的与亲身经历过的内容（来自记忆事实）：\n\n我的身份与经历（MY IDENTITY & EXPERIENCES）：\n"
+_THINK_PROMPT_WORLD_SEP = "\n\n我对世界的了解（WHAT I KNOW ABOUT THE WORLD）：\n"
+_THINK_PROMPT_OPINION_SEP = "\n\n我已有的观点与信念（MY EXISTING OPINIONS & BELIEFS）：\n"
+_THINK_PROMPT_CONTEXT_PREFIX = "\n补充上下文（补充上下文）：\n"
+_THINK_PROMPT_NAME_PREFIX = "\n\nYour name: "
+_THINK_PROMPT_BACKGROUND_PREFIX = "\n\nYour background:\n"
+_THINK_PROMPT_QUERY_SEP = "\n\n问题：\n"
+_THINK_PROMPT_FOOTER = (
+    "\n\n请基于我所知道的一切、我已有的观点、以及“我是谁”（包括姓名、性格倾向、背景）来作答。"
+    "用第一人称自然表达（例如“我认为/我觉得/在我看来/我相信”），给出我真实的看法与理由。"
+    "要求：只输出纯文本，不要使用 Markdown。并且请用简体中文回答。专有名词（人名/组织名/产品名等）保持原文不翻译。"
+)
+
+# Static parts of the think system message, around the disposition-specific instruction
+_SYSTEM_MESSAGE_PREFIX = (
+    "你是一个有自己想法、经历、观点与性格倾向的人。当被提问时，请像真人一样自然回答——"
+    "基于你所知道与经历过的内容，表达你真正的看法。"
+)
+_SYSTEM_MESSAGE_SUFFIX = (
+    " 请直接、明确地表达观点，并使用第一人称（例如：‘我认为’、‘我觉得’、‘在我看来’、‘我相信’）。"
+    "只输出纯文本，不要使用 Markdown。请用简体中文回答。专有名词（人名/组织名/产品名等）保持原文不翻译。"
+)
 
 
 def build_think_prompt(
@@ -104,76 +231,72 @@ def build_think_prompt(
     context: str | None = None,
 ) -> str:
     """Build the think prompt for the LLM."""
-    disposition_desc = build_disposition_description(disposition)
-
-    name_section = f"""
-
-Your name: {name}
-"""
-
-    background_section = ""
-    if background:
-        background_section = f"""
-
-Your background:
-{background}
-"""
-
-    context_section = ""
+    parts = [
+        _THINK_PROMPT_HEADER,
+        agent_facts_text,
+        _THINK_PROMPT_WORLD_SEP,
+        world_facts_text,
+        _THINK_PROMPT_OPINION_SEP,
+        opinion_facts_text,
+        "\n\n",
+    ]
     if context:
-        context_section = f"""
-补充上下文（补充上下文）：
-{context}
-
-"""
-
-    return f"""以下是我所知道的与亲身经历过的内容（来自记忆事实）：
-
-我的身份与经历（MY IDENTITY & EXPERIENCES）：
-{agent_facts_text}
-
-我对世界的了解（WHAT I KNOW ABOUT THE WORLD）：
-{world_facts_text}
-
-我已有的观点与信念（MY EXISTING OPINIONS & BELIEFS）：
-{opinion_facts_text}
-
-{context_section}{name_section}{disposition_desc}{background_section}
-
-问题：
-{query}
+        parts += (_THINK_PROMPT_CONTEXT_PREFIX, context, "\n\n")
+    parts += (_THINK_PROMPT_NAME_PREFIX, name, "\n", build_disposition_description(disposition))
+    if background:
+        parts += (_THINK_PROMPT_BACKGROUND_PREFIX, background, "\n")
+    parts += (_THINK_PROMPT_QUERY_SEP, query, _THINK_PROMPT_FOOTER)
 
-请基于我所知道的一切、我已有的观点、以及“我是谁”（包括姓名、性格倾向、背景）来作答。用第一人称自然表达（例如“我认为/我觉得/在我看来/我相信”），给出我真实的看法与理由。要求：只输出纯文本，不要使用 Markdown。并且请用简体中文回答。专有名词（人名/组织名/产品名等）保持原文不翻译。"""
+    return "".join(parts)
 
 
 def get_system_message(disposition: DispositionTraits) -> str:
     """Get the system message for the think LLM call."""
+    return _get_system_message_cached(_disposition_key(disposition))
+
+
+@functools.lru_cache(maxsize=128)
+def _get_system_message_cached(key: _DispositionKey) -> str:
+    """Build the think system message for a trait triple."""
+    skepticism, literalism, empathy = key
     # Build disposition-specific instructions based on trait values
     instructions = []
 
     # Skepticism influences how much to question/doubt information
-    if disposition.skepticism >= 4:
+    if skepticism >= 4:
         instructions.append("对断言保持怀疑，留意潜在问题或不一致之处。")
-    elif disposition.skepticism <= 2:
+    elif skepticism <= 2:
         instructions.append("倾向于信任已给出的信息，并按字面理解陈述。")
 
     # Literalism influences interpretation style
-    if disposition.literalism >= 4:
+    if literalism >= 4:
         instructions.append("更偏向字面理解信息，重点关注精确措辞与明确承诺。")
-    elif disposition.literalism <= 2:
+    elif literalism <= 2:
         instructions.append("善于读懂弦外之音，并考虑暗示意义与语境。")
 
     # Empathy influences consideration of emotional factors
-    if disposition.empathy >= 4:
+    if empathy >= 4:
         instructions.append("考虑信息背后的情绪状态与处境因素。")
-    elif disposition.empathy <= 2:
+    elif empathy <= 2:
         instructions.append("更关注事实与结果，而不是情绪背景。")
 
     disposition_instruction = (
         " ".join(instructions) if instructions else "在理解信息时平衡你的性格倾向。"
     )
 
-    return f"你是一个有自己想法、经历、观点与性格倾向的人。当被提问时，请像真人一样自然回答——基于你所知道与经历过的内容，表达你真正的看法。{disposition_instruction} 请直接、明确地表达观点，并使用第一人称（例如：‘我认为’、‘我觉得’、‘在我看来’、‘我相信’）。只输出纯文本，不要使用 Markdown。请用简体中文回答。专有名词（人名/组织名/产品名等）保持原文不翻译。"
+    return "".join([_SYSTEM_MESSAGE_PREFIX, disposition_instruction, _SYSTEM_MESSAGE_SUFFIX])
+
+
+# reflect's default disposition, and its system message built once at import
+_DEFAULT_DISPOSITION = DispositionTraits(skepticism=3, literalism=3, empathy=3)
+_DEFAULT_SYSTEM_MESSAGE = get_system_message(_DEFAULT_DISPOSITION)
+
+# Answers shorter than this (after stripping) are too short to hold an opinion. Kept low
+# because Chinese packs a full opinion into few characters ("我认为她更可靠")
+OPINION_MIN_TEXT_CHARS = 5
+
+# Whole answers that state a lack of information rather than an opinion
+_NO_OPINION_SENTINELS = frozenset({"不知道", "我不知道", "我没有足够信息", "无法回答", "我无法回答"})
 
 
 async def extract_opinions_from_text(llm_config, text: str, query: str) -> list[Opinion]:
@@ -188,6 +311,12 @@ async def extract_opinions_from_text(llm_config, text: str, query: str) -> list[
     Returns:
         List of Opinion objects with text and confidence
     """
+    # Skip the LLM round-trip for answers that cannot hold an opinion; the prompt below
+    # lists these "no information" replies as non-opinions anyway
+    stripped = text.strip().rstrip("。.！!") if text else ""
+    if len(stripped) < OPINION_MIN_TEXT_CHARS or stripped in _NO_OPINION_SENTINELS:
+        return []
+
     extraction_prompt = f"""请从下面的回答中抽取任何“新的观点/立场/判断”，并把它们改写成**第一人称**（仿佛是“你自己”在直接表态）。
 
 原始问题：
@@ -231,6 +360,8 @@ async def extract_opinions_from_text(llm_config, text: str, query: str) -> list[
 如果没有任何真实观点（例如回答只是说‘不知道’），请返回空列表。"""
 
     try:
+        # call() returns the OpinionExtractionResponse already parsed and validated from the
+        # raw JSON (model_validate_json in one pass), so no decoding is done here
         result = await llm_config.call(
             messages=[
                 {
@@ -243,70 +374,12 @@ async def extract_opinions_from_text(llm_config, text: str, query: str) -> list[
             scope="memory_extract_opinion",
         )
 
-        # Format opinions with confidence score and convert to first-person
-        formatted_opinions = []
-        for op in result.opinions:
-            # Convert third-person to first-person if needed
-            opinion_text = op.opinion
-
-            # Replace common third-person patterns with first-person
-            def singularize_verb(verb):
-                if verb.endswith("es"):
-                    return verb[:-1]  # believes -> believe
-                elif verb.endswith("s"):
-                    return verb[:-1]  # thinks -> think
-                return verb
-
-            # 中文第三人称模式："说话者/用户/他们 认为..." -> "我认为..."
-            cn_match = re.match(
-                r"^(说话者|用户|对方|回答者|他们|她们|他|她)\s*(认为|觉得|相信|感觉|说|表示|主张|指出|提到|强调)(\s*：|\s*是|\s*说|\s*认为|\s*觉得|\s*相信)?(.*)$",
-                opinion_text.strip(),
-            )
-            if cn_match:
-                # 统一改写为第一人称
-                rest = cn_match.group(4).lstrip()
-                # 如果 rest 已经以“我”开头则不重复
-                if rest.startswith("我"):
-                    opinion_text = rest
-                else:
-                    # 尽量保留原句结构
-                    verb = cn_match.group(2)
-                    if verb in ["说", "表示", "强调", "提到", "指出"]:
-                        opinion_text = f"我{verb}{rest}"
-                    else:
-                        opinion_text = f"我{verb}{rest}"
-            # Pattern: "The speaker/user [verb]..." -> "I [verb]..."
-            match = re.match(
-                r"^(The speaker|The user|They|It is believed) (believes?|thinks?|feels?|says|asserts?|considers?)(\s+that)?(.*)$",
-                opinion_text,
-                re.IGNORECASE,
-            )
-            if match:
-                verb = singularize_verb(match.group(2))
-                that_part = match.group(3) or ""  # Keep " that" if present
-                rest = match.group(4)
-                opinion_text = f"I {verb}{that_part}{rest}"
-
-            # If still doesn't start with first-person, prepend "I believe that "
-            first_person_starters = [
-                "我认为",
-                "我相信",
-                "我觉得",
-                "在我看来",
-                "我逐渐相信",
-                "以前我",
-                # 兼容少量英文输出（兜底）
-                "I think",
-                "I believe",
-                "I feel",
-                "In my view",
-                "I've come to believe",
-                "Previously I",
-            ]
-            if not any(opinion_text.startswith(starter) for starter in first_person_starters):
-                opinion_text = "我认为" + (opinion_text if opinion_text.startswith(("：",":")) else "：" + opinion_text)
-
-            formatted_opinions.append(Opinion(opinion=opinion_text, confidence=op.confidence))
+        # Format opinions with confidence score and convert to first-person. Both fields were
+        # already validated as part of OpinionExtractionResponse, so skip re-validation
+        formatted_opinions = [
+            Opinion.model_construct(opinion=_to_first_person(op.opinion), confidence=op.confidence)
+            for op in result.opinions
+        ]
 
         return formatted_opinions
 
@@ -315,8 +388,23 @@ async def extract_opinions_from_text(llm_config, text: str, query: str) -> list[
         return []
 
 
-async def reflect(
-    llm_config,
+async def extract_opinions_from_text_batch(llm_config, items: list[tuple[str, str]]) -> list[list[Opinion]]:
+    """
+    Extract opinions from several texts concurrently.
+
+    Args:
+        llm_config: LLM configuration to use
+        items: (text, query) pairs, as passed to extract_opinions_from_text
+
+    Returns:
+        One list of Opinion objects per item, in the same order as items
+    """
+    # extract_opinions_from_text already turns failures into an empty list, so one
+    # failed extraction does not cancel the others
+    return list(await asyncio.gather(*[extract_opinions_from_text(llm_config, text, query) for text, query in items]))
+
+
+def _build_reflect_messages(
     query: str,
     experience_facts: list[str] = None,
     world_facts: list[str] = None,
@@ -325,36 +413,27 @@ async def reflect(
     disposition: DispositionTraits = None,
     background: str = "",
     context: str = None,
-) -> str:
+) -> list[dict]:
     """
-    Standalone reflect function for generating answers based on facts.
-
-    This is a static version of the reflect operation that can be called
-    without a MemoryEngine instance, useful for testing.
+    Build the system/user messages for a standalone reflect call.
 
-    Args:
-        llm_config: LLM provider instance
-        query: Question to answer
-        experience_facts: List of experience/agent fact strings
-        world_facts: List of world fact strings
-        opinion_facts: List of opinion fact strings
-        name: Name of the agent/persona
-        disposition: Disposition traits (defaults to neutral)
-        background: Background information
-        context: Additional context for the prompt
-
-    Returns:
-        Generated answer text
+    Fact formatting and prompt assembly are CPU-bound and scale with the fact lists, so the
+    reflect functions run this off the event loop (asyncio.to_thread) to keep concurrent
+    requests progressing.
     """
-    # Default disposition if not provided
+    # Default (neutral) disposition if not provided, with its prebuilt system message
     if disposition is None:
-        disposition = DispositionTraits(skepticism=3, literalism=3, empathy=3)
+        disposition = _DEFAULT_DISPOSITION
+        system_message = _DEFAULT_SYSTEM_MESSAGE
+    else:
+        system_message = get_system_message(disposition)
 
     # Convert string lists to MemoryFact format for formatting
     def to_memory_facts(facts: list[str], fact_type: str) -> list[MemoryFact]:
         if not facts:
             return []
-        return [MemoryFact(id=f"test-{i}", text=f, fact_type=fact_type) for i, f in enumerate(facts)]
+        # Plain strings built right here, so skip per-fact validation
+        return [MemoryFact.model_construct(id=f"test-{i}", text=f, fact_type=fact_type) for i, f in enumerate(facts)]
 
     agent_results = to_memory_facts(experience_facts or [], "experience")
     world_results = to_memory_facts(world_facts or [], "world")
@@ -377,14 +456,149 @@ async def reflect(
         context=context,
     )
 
-    system_message = get_system_message(disposition)
+    return [{"role": "system", "content": system_message}, {"role": "user", "content": prompt}]
+
+
+def _build_all_reflect_messages(items: list[dict]) -> list[list[dict]]:
+    """Build the messages for each reflect() keyword-argument dict in items."""
+    return [_build_reflect_messages(**item) for item in items]
+
+
+async def reflect(
+    llm_config,
+    query: str,
+    experience_facts: list[str] = None,
+    world_facts: list[str] = None,
+    opinion_facts: list[str] = None,
+    name: str = "Assistant",
+    disposition: DispositionTraits = None,
+    background: str = "",
+    context: str = None,
+) -> str:
+    """
+    Standalone reflect function for generating answers based on facts.
+
+    This is a static version of the reflect operation that can be called
+    without a MemoryEngine instance, useful for testing.
+
+    Args:
+        llm_config: LLM provider instance
+        query: Question to answer
+        experience_facts: List of experience/agent fact strings
+        world_facts: List of world fact strings
+        opinion_facts: List of opinion fact strings
+        name: Name of the agent/persona
+        disposition: Disposition traits (defaults to neutral)
+        background: Background information
+        context: Additional context for the prompt
+
+    Returns:
+        Generated answer text
+    """
+    messages = await asyncio.to_thread(
+        _build_reflect_messages,
+        query=query,
+        experience_facts=experience_facts,
+        world_facts=world_facts,
+        opinion_facts=opinion_facts,
+        name=name,
+        disposition=disposition,
+        background=background,
+        context=context,
+    )
 
     # Call LLM
     answer_text = await llm_config.call(
-        messages=[{"role": "system", "content": system_message}, {"role": "user", "content": prompt}],
+        messages=messages,
         scope="memory_think",
         temperature=0.9,
         max_completion_tokens=1000,
     )
 
     return answer_text.strip()
+
+
+# reflect_stream forwards the streamed answer in windows of this many seconds rather than per token
+REFLECT_STREAM_FLUSH_INTERVAL = 0.2
+
+
+async def reflect_stream(
+    llm_config,
+    query: str,
+    experience_facts: list[str] = None,
+    world_facts: list[str] = None,
+    opinion_facts: list[str] = None,
+    name: str = "Assistant",
+    disposition: DispositionTraits = None,
+    background: str = "",
+    context: str = None,
+) -> AsyncIterator[str]:
+    """
+    Streaming variant of reflect that yields the answer while it is generated.
+
+    Streamed chunks are buffered and forwarded at most every REFLECT_STREAM_FLUSH_INTERVAL
+    seconds. Leading whitespace is dropped like in reflect; trailing whitespace cannot be
+    known in advance and is kept. Takes the same arguments as reflect.
+    """
+    messages = await asyncio.to_thread(
+        _build_reflect_messages,
+        query=query,
+        experience_facts=experience_facts,
+        world_facts=world_facts,
+        opinion_facts=opinion_facts,
+        name=name,
+        disposition=disposition,
+        background=background,
+        context=context,
+    )
+
+    buffer: list[str] = []
+    started = False
+    last_flush = time.monotonic()
+    async for chunk in llm_config.call_stream(
+        messages=messages,
+        scope="memory_think",
+        temperature=0.9,
+        max_completion_tokens=1000,
+    ):
+        if not started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            started = True
+        buffer.append(chunk)
+        now = time.monotonic()
+        if now - last_flush >= REFLECT_STREAM_FLUSH_INTERVAL:
+            yield "".join(buffer)
+            buffer.clear()
+            last_flush = now
+
+    if buffer:
+        yield "".join(buffer)
+
+
+async def reflect_batch(llm_config, items: list[dict]) -> list[str]:
+    """
+    Run several independent reflect calls concurrently.
+
+    Args:
+        llm_config: LLM provider instance
+        items: One dict of reflect() keyword arguments (query, experience_facts, ...) per call
+
+    Returns:
+        Generated answer texts, in the same order as items
+    """
+    # Build every prompt up front (off the event loop), then issue all LLM calls at once
+    all_messages = await asyncio.to_thread(_build_all_reflect_messages, items)
+    answers = await asyncio.gather(
+        *[
+            llm_config.call(
+                messages=messages,
+                scope="memory_think",
+                temperature=0.9,
+                max_completion_tokens=1000,
+            )
+            for messages in all_messages
+        ]
+    )
+    return [answer.strip() for answer in answers]
@@ -171,6 +171,7 @@ def main():
             llm_base_url=config.llm_base_url,
             llm_max_concurrent=config.llm_max_concurrent,
             llm_timeout=config.llm_timeout,
+            llm_max_tokens_per_minute=config.llm_max_tokens_per_minute,
             embeddings_provider=config.embeddings_provider,
             embeddings_local_model=config.embeddings_local_model,
             embeddings_tei_url=config.embeddings_tei_url,
@@ -186,6 +187,8 @@ def main():
             observation_top_entities=config.observation_top_entities,
             skip_llm_verification=config.skip_llm_verification,
             lazy_reranker=config.lazy_reranker,
+            fact_extraction_cache_size=config.fact_extraction_cache_size,
+            migration_async_commit=config.migration_async_commit,
         )
     config.configure_logging()
     if not args.daemon:
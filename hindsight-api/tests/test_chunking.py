@@ -1,6 +1,8 @@
 """
 Test chunking functionality for large documents.
 """
+import json
+
 import pytest
 from hindsight_api.engine.retain.fact_extraction import chunk_text
 
@@ -54,3 +56,21 @@ def test_chunk_text_64k():
     combined_length = sum(len(chunk) for chunk in chunks)
     assert combined_length >= len(text) * 0.95, "Lost too much content during chunking"
 
+
+def test_chunk_text_conversation_turn_boundaries():
+    """Test that JSON conversations are chunked at turn boundaries without losing turns."""
+    turns = [
+        {"role": "user" if i % 2 else "assistant", "content": f"消息 {i}: " + "hello " * (i % 5 + 1)}
+        for i in range(40)
+    ]
+    text = json.dumps(turns, ensure_ascii=False)
+
+    chunks = chunk_text(text, max_chars=300)
+
+    assert len(chunks) > 1, "Large conversation should be chunked"
+    for chunk in chunks:
+        assert len(chunk) <= 300, f"Chunk exceeds max_chars: {len(chunk)}"
+
+    # Every chunk is a valid JSON array of complete turns, in the original order
+    rejoined = [turn for chunk in chunks for turn in json.loads(chunk)]
+    assert rejoined == turns
@@ -0,0 +1,80 @@
+"""
+Tests for splitting extraction chunks whose LLM request times out.
+"""
+from datetime import UTC, datetime
+
+import pytest
+
+from hindsight_api.engine.llm_wrapper import LLMTimeoutError
+from hindsight_api.engine.retain import fact_extraction
+from hindsight_api.engine.retain.fact_extraction import MIN_TIMEOUT_SPLIT_CHARS, _extract_facts_with_auto_split
+
+EVENT_DATE = datetime(2024, 12, 10, tzinfo=UTC)
+
+
+def make_chunk(chars: int) -> str:
+    """Build a chunk of roughly the given length out of short sentences."""
+    sentence = "Alice talked about her day at work. "
+    return (sentence * (chars // len(sentence) + 1))[:chars]
+
+
+class TimeoutLLM:
+    """LLM config stub raising LLMTimeoutError for chunks longer than max_chars."""
+
+    provider = "stub"
+    model = "stub-model"
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self.chunk_lengths = []
+
+    async def call(self, messages, **kwargs):
+        # The chunk text is the last part of the user message, after "文本：\n"
+        chunk = messages[1]["content"].split("文本：\n", 1)[1]
+        self.chunk_lengths.append(len(chunk))
+        if len(chunk) > self.max_chars:
+            raise LLMTimeoutError("LLM request timed out after 4 attempts")
+        return {
+            "facts": [
+                {
+                    "what": f"Alice 谈到了工作（{len(chunk)} 字符）",
+                    "when": "N/A",
+                    "who": "Alice",
+                    "why": "N/A",
+                    "fact_type": "world",
+                    "fact_kind": "conversation",
+                }
+            ]
+        }
+
+
+@pytest.fixture(autouse=True)
+def no_extraction_cache(monkeypatch):
+    """Keep the response cache out of these tests."""
+    monkeypatch.setattr(fact_extraction, "_extraction_cache_size", 0)
+
+
+@pytest.mark.asyncio
+async def test_timeout_splits_large_chunk_in_half():
+    """A timed-out chunk of at least MIN_TIMEOUT_SPLIT_CHARS is halved and both halves are extracted."""
+    chunk = make_chunk(MIN_TIMEOUT_SPLIT_CHARS * 2)
+    llm = TimeoutLLM(max_chars=MIN_TIMEOUT_SPLIT_CHARS * 3 // 2)
+
+    facts = await _extract_facts_with_auto_split(chunk, 0, 1, EVENT_DATE, "chat", llm)
+
+    assert llm.chunk_lengths[0] == len(chunk)
+    assert len(llm.chunk_lengths) == 3
+    assert all(length <= llm.max_chars for length in llm.chunk_lengths[1:])
+    assert len(facts) == 2
+
+
+@pytest.mark.asyncio
+async def test_timeout_on_small_chunk_is_raised():
+    """Below MIN_TIMEOUT_SPLIT_CHARS a timeout is re-raised instead of splitting further."""
+    chunk = make_chunk(MIN_TIMEOUT_SPLIT_CHARS - 1)
+    llm = TimeoutLLM(max_chars=0)
+
+    with pytest.raises(LLMTimeoutError):
+        await _extract_facts_with_auto_split(chunk, 0, 1, EVENT_DATE, "chat", llm)
+
+    assert llm.chunk_lengths == [len(chunk)]
@@ -0,0 +1,106 @@
+"""
+Tests for the LRU cache of raw LLM fact extraction responses.
+"""
+from collections import OrderedDict
+from datetime import UTC, datetime
+
+import pytest
+
+from hindsight_api.engine.retain import fact_extraction
+from hindsight_api.engine.retain.fact_extraction import _extract_facts_from_chunk
+
+EVENT_DATE = datetime(2024, 12, 10, tzinfo=UTC)
+
+VALID_FACT = {
+    "what": "Alice 喜欢喝茶",
+    "when": "N/A",
+    "who": "Alice",
+    "why": "N/A",
+    "fact_type": "world",
+    "fact_kind": "conversation",
+}
+
+
+class StubLLM:
+    """LLM config stub that returns canned extraction responses and counts calls."""
+
+    provider = "stub"
+    model = "stub-model"
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = 0
+
+    async def call(self, **kwargs):
+        self.calls += 1
+        return self.response
+
+
+@pytest.fixture(autouse=True)
+def extraction_cache(monkeypatch):
+    """Start every test with an empty cache of size 2 and no retry backoff."""
+    monkeypatch.setattr(fact_extraction, "_extraction_cache", OrderedDict())
+    monkeypatch.setattr(fact_extraction, "_extraction_cache_size", 2)
+    monkeypatch.setattr(fact_extraction, "_extraction_retry_backoff", lambda attempt: 0)
+    return fact_extraction._extraction_cache
+
+
+async def extract(llm, chunk="Alice 说她喜欢喝茶。"):
+    return await _extract_facts_from_chunk(chunk, 0, 1, EVENT_DATE, "chat", llm)
+
+
+@pytest.mark.asyncio
+async def test_identical_chunk_hits_cache():
+    """Re-extracting the same chunk reuses the cached response on the first attempt."""
+    llm = StubLLM({"facts": [VALID_FACT]})
+
+    first = await extract(llm)
+    second = await extract(llm)
+
+    assert llm.calls == 1
+    assert [f.fact for f in second] == [f.fact for f in first]
+
+
+@pytest.mark.asyncio
+async def test_malformed_response_is_not_cached():
+    """A response with malformed facts is retried and never stored in the cache."""
+    llm = StubLLM({"facts": [VALID_FACT, "not a fact"]})
+
+    facts = await extract(llm)
+    assert len(facts) == 1
+    assert llm.calls == 2  # malformed on attempt 0, retried once
+    assert len(fact_extraction._extraction_cache) == 0
+
+    await extract(llm)
+    assert llm.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    """Beyond the configured size the least recently used response is evicted."""
+    llm = StubLLM({"facts": [VALID_FACT]})
+
+    await extract(llm, "chunk a")
+    await extract(llm, "chunk b")
+    await extract(llm, "chunk a")  # hit: a becomes most recently used
+    await extract(llm, "chunk c")  # evicts b
+    assert llm.calls == 3
+    assert len(fact_extraction._extraction_cache) == 2
+
+    await extract(llm, "chunk a")
+    assert llm.calls == 3
+    await extract(llm, "chunk b")
+    assert llm.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_cache_size_zero_disables_cache(monkeypatch):
+    """With size 0 every extraction calls the LLM and nothing is stored."""
+    monkeypatch.setattr(fact_extraction, "_extraction_cache_size", 0)
+    llm = StubLLM({"facts": [VALID_FACT]})
+
+    await extract(llm)
+    await extract(llm)
+
+    assert llm.calls == 2
+    assert len(fact_extraction._extraction_cache) == 0
@@ -17,7 +17,7 @@ from datetime import UTC, datetime
 import pytest
 
 from hindsight_api import LLMConfig
-from hindsight_api.engine.retain.fact_extraction import extract_facts_from_text
+from hindsight_api.engine.retain.fact_extraction import _infer_temporal_date, extract_facts_from_text
 
 # =============================================================================
 # DIMENSION PRESERVATION TESTS
@@ -607,6 +607,26 @@ Yesterday I went for a morning jog for the first time in a nearby park.
         for fact in facts:
             assert fact.occurred_start, f"Fact should have a date: {fact.fact}"
 
+    def test_infer_temporal_date_fallback(self):
+        """Test the regex fallback used when the LLM omits occurred_start."""
+        event_date = datetime(2024, 11, 13, 15, 30, 0, tzinfo=UTC)
+
+        assert _infer_temporal_date("I went jogging yesterday", event_date) == "2024-11-12T00:00:00+00:00"
+        assert _infer_temporal_date("Dinner TONIGHT with Bob", event_date) == "2024-11-13T00:00:00+00:00"
+        assert _infer_temporal_date("Moving next month", event_date) == "2024-12-13T00:00:00+00:00"
+        assert _infer_temporal_date("Alice works at Google", event_date) is None
+        # "yesterday" partial words don't match
+        assert _infer_temporal_date("yesterdays news", event_date) is None
+
+    def test_infer_temporal_date_priority(self):
+        """Test that the earlier expression in the priority list wins, not the earlier one in the text."""
+        event_date = datetime(2024, 11, 13, tzinfo=UTC)
+
+        # "last week" appears first in the text, but "yesterday" has priority
+        assert _infer_temporal_date("Last week I planned it, yesterday I did it", event_date) == (
+            "2024-11-12T00:00:00+00:00"
+        )
+
 
 # =============================================================================
 # LOGICAL INFERENCE TESTS
@@ -1,9 +1,13 @@
 """
 Test LLM provider with different models using actual memory operations.
 """
+import asyncio
 import os
 from datetime import datetime
+from types import SimpleNamespace
 import pytest
+from pydantic import BaseModel, ValidationError
+from hindsight_api.engine import llm_wrapper
 from hindsight_api.engine.llm_wrapper import LLMProvider
 from hindsight_api.engine.utils import extract_facts
 from hindsight_api.engine.search.think_utils import reflect
@@ -117,3 +121,168 @@ async def test_llm_provider_memory_operations(provider: str, model: str):
 
     assert response is not None, f"{provider}/{model} reflect returned None"
     assert len(response) > 10, f"{provider}/{model} reflect response too short"
+
+
+class FakeClock:
+    """
+    Manual clock for the token budget tests.
+
+    With auto_advance, sleep() moves time forward instantly; otherwise it waits until
+    the test advances `now` past the wake-up time.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self.auto_advance = True
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        wake_at = self.now + seconds
+        if self.auto_advance:
+            self.now = wake_at
+        # Always yield to the event loop so other waiters can run
+        await asyncio.sleep(0)
+        while self.now < wake_at:
+            await asyncio.sleep(0)
+
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    """Patch the clock and sleep used by llm_wrapper with a FakeClock."""
+    clock = FakeClock()
+    monkeypatch.setattr(llm_wrapper, "time", SimpleNamespace(monotonic=clock.monotonic))
+    monkeypatch.setattr(llm_wrapper, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep))
+    return clock
+
+
+@pytest.mark.asyncio
+async def test_token_budget_refills_over_time(fake_clock):
+    """An empty budget refills at capacity per minute and the request waits just long enough."""
+    budget = llm_wrapper._TokenBudget(600)
+
+    # A full bucket admits up to capacity without waiting
+    await budget.acquire(600)
+    assert fake_clock.sleeps == []
+
+    # 600 tokens/minute refill at 10 tokens/second: 60 tokens need 6 seconds
+    await budget.acquire(60)
+    assert sum(fake_clock.sleeps) == pytest.approx(6.0)
+
+    # Time passing on its own refills the bucket again
+    fake_clock.now += 60
+    fake_clock.sleeps.clear()
+    await budget.acquire(600)
+    assert fake_clock.sleeps == []
+
+
+@pytest.mark.asyncio
+async def test_token_budget_admits_in_arrival_order(fake_clock):
+    """A small request arriving after a large one does not overtake it."""
+    budget = llm_wrapper._TokenBudget(60)
+    await budget.acquire(60)  # drain the bucket
+
+    admitted = []
+
+    async def request(name, tokens):
+        await budget.acquire(tokens)
+        admitted.append(name)
+
+    fake_clock.auto_advance = False
+    large = asyncio.create_task(request("large", 30))
+    await asyncio.sleep(0)  # let the large request start waiting first
+    small = asyncio.create_task(request("small", 1))
+
+    # Enough refill for the small request, but it must keep queueing behind the large one
+    fake_clock.now += 5
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert admitted == []
+
+    fake_clock.now += 30
+    await asyncio.gather(large, small)
+
+    assert admitted == ["large", "small"]
+
+
+@pytest.mark.asyncio
+async def test_token_budget_clamps_request_larger_than_capacity(fake_clock):
+    """A request above capacity only waits for a full bucket instead of forever."""
+    budget = llm_wrapper._TokenBudget(100)
+
+    # Full bucket: admitted immediately, draining it completely
+    await budget.acquire(1000)
+    assert fake_clock.sleeps == []
+
+    # Next oversized request waits for one full refill (one minute), not ten
+    await budget.acquire(1000)
+    assert sum(fake_clock.sleeps) == pytest.approx(60.0)
+
+
+class ParsedAnswer(BaseModel):
+    answer: int
+
+
+def stub_openai_provider(contents):
+    """An OpenAI provider whose client returns the given message contents, one per request."""
+    provider = LLMProvider(provider="openai", api_key="test", base_url="", model="gpt-4o-mini")
+    requests = []
+
+    async def create(**params):
+        requests.append(params)
+        message = SimpleNamespace(content=contents[len(requests) - 1])
+        usage = SimpleNamespace(prompt_tokens=1, completion_tokens=1, total_tokens=2)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")], usage=usage)
+
+    provider._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    return provider, requests
+
+
+MESSAGES = [{"role": "user", "content": "Answer as JSON"}]
+
+
+@pytest.mark.asyncio
+async def test_structured_call_retries_malformed_json():
+    """Unparseable JSON is retried and the next valid response is validated."""
+    provider, requests = stub_openai_provider(['{"answer": ', '{"answer": 42}'])
+
+    result = await provider.call(MESSAGES, response_format=ParsedAnswer, initial_backoff=0, max_retries=2)
+
+    assert result == ParsedAnswer(answer=42)
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_structured_call_gives_up_on_persistently_malformed_json():
+    """After the last retry, malformed JSON surfaces as pydantic's ValidationError (json_invalid)."""
+    provider, requests = stub_openai_provider(["not json"] * 3)
+
+    with pytest.raises(ValidationError) as exc_info:
+        await provider.call(MESSAGES, response_format=ParsedAnswer, initial_backoff=0, max_retries=2)
+
+    assert exc_info.value.errors()[0]["type"] == "json_invalid"
+    assert len(requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_structured_call_schema_mismatch_propagates():
+    """A well-formed response that does not match the schema is raised without retrying."""
+    provider, requests = stub_openai_provider(['{"answer": "not a number"}', '{"answer": 42}'])
+
+    with pytest.raises(ValidationError):
+        await provider.call(MESSAGES, response_format=ParsedAnswer, initial_backoff=0, max_retries=2)
+
+    assert len(requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_structured_call_skip_validation_returns_raw_json():
+    """With skip_validation the parsed JSON is returned as-is, even if it does not match the schema."""
+    provider, _ = stub_openai_provider(['{"answer": "not a number", "extra": [1, 2]}'])
+
+    result = await provider.call(MESSAGES, response_format=ParsedAnswer, skip_validation=True)
+
+    assert result == {"answer": "not a number", "extra": [1, 2]}
@@ -1,9 +1,14 @@
 """
 Test think function for opinion generation and consistency.
 """
+import asyncio
 import pytest
 from datetime import datetime, timezone
+from types import SimpleNamespace
+from hindsight_api.engine import llm_wrapper
+from hindsight_api.engine.llm_wrapper import LLMProvider
 from hindsight_api.engine.memory_engine import Budget
+from hindsight_api.engine.search import think_utils
 from hindsight_api import RequestContext
 
 
@@ -154,3 +159,97 @@ async def test_think_without_prior_context(memory, request_context):
     assert result.text, "Should return some answer"
     assert result.based_on, "Should return based_on structure"
 
+
+class StreamClock:
+    """Fake monotonic clock for think_utils, advanced by the stream stub."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def monotonic(self):
+        return self.now
+
+
+class StubStreamProvider:
+    """LLM config stub whose call_stream yields chunks, advancing the clock before each one."""
+
+    def __init__(self, clock, chunks, step):
+        self.clock = clock
+        self.chunks = chunks
+        self.step = step
+        self.calls = []
+
+    async def call_stream(self, **kwargs):
+        self.calls.append(kwargs)
+        for chunk in self.chunks:
+            self.clock.now += self.step
+            yield chunk
+
+
+@pytest.mark.asyncio
+async def test_reflect_stream_flushes_in_windows(monkeypatch):
+    """Chunks are buffered and forwarded once per REFLECT_STREAM_FLUSH_INTERVAL, leading whitespace dropped."""
+    clock = StreamClock()
+    monkeypatch.setattr(think_utils, "time", SimpleNamespace(monotonic=clock.monotonic))
+    # A chunk every 0.6 flush intervals: the window closes on every second chunk, counted
+    # from the start of the stream (the skipped whitespace chunk included)
+    step = think_utils.REFLECT_STREAM_FLUSH_INTERVAL * 0.6
+    provider = StubStreamProvider(clock, [" \n", " 我", "认为", "Alice", "更", "可靠"], step)
+
+    flushed = [part async for part in think_utils.reflect_stream(provider, "谁更可靠？", world_facts=["Alice 按时交付"])]
+
+    assert flushed == ["我", "认为Alice", "更可靠"]
+    assert provider.calls[0]["scope"] == "memory_think"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("provider_name", ["gemini", "anthropic"])
+async def test_call_stream_falls_back_to_single_chunk(monkeypatch, provider_name):
+    """Providers without native streaming yield the whole call() answer as one chunk."""
+    provider = LLMProvider(provider=provider_name, api_key="test", base_url="", model="test-model")
+    calls = []
+
+    async def call(**kwargs):
+        calls.append(kwargs)
+        return "完整的回答"
+
+    monkeypatch.setattr(provider, "call", call)
+
+    chunks = [chunk async for chunk in provider.call_stream([{"role": "user", "content": "hi"}], temperature=0.5)]
+
+    assert chunks == ["完整的回答"]
+    assert calls[0]["temperature"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_call_stream_holds_budget_and_slot_for_whole_stream(monkeypatch):
+    """The token budget is acquired once up front and the concurrency slot is held until the stream ends."""
+    semaphore = asyncio.Semaphore(1)
+    acquired = []
+
+    class RecordingBudget:
+        async def acquire(self, tokens):
+            acquired.append(tokens)
+
+    monkeypatch.setattr(llm_wrapper, "_global_llm_semaphore", semaphore)
+    monkeypatch.setattr(llm_wrapper, "_global_token_budget", RecordingBudget())
+
+    async def stream():
+        for text in ["我", None, "认为"]:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+    async def create(**params):
+        assert params["stream"] is True
+        return stream()
+
+    provider = LLMProvider(provider="openai", api_key="test", base_url="", model="gpt-4o-mini")
+    provider._client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    messages = [{"role": "user", "content": "x" * 400}]
+    chunks = provider.call_stream(messages)
+    assert await chunks.__anext__() == "我"
+    assert acquired == [100]
+    assert semaphore.locked()
+
+    assert [chunk async for chunk in chunks] == ["认为"]
+    assert not semaphore.locked()
@@ -41,13 +41,34 @@ Using context manager:
     ```
 """
 
-from .server import Server as HindsightServer, start_server
+from typing import TYPE_CHECKING
 
-# Re-export Client from hindsight-client
-from hindsight_client import Hindsight as HindsightClient
+if TYPE_CHECKING:
+    from hindsight_client import Hindsight as HindsightClient
+
+    from .server import Server as HindsightServer, start_server
 
 __all__ = [
     "HindsightServer",
     "start_server",
     "HindsightClient",
 ]
+
+
+def __getattr__(name: str):
+    # Resolve exports lazily: .server pulls in the whole hindsight_api app (FastAPI, models,
+    # database engine, uvicorn), which client-only users should not pay for on import
+    if name == "HindsightServer":
+        from .server import Server
+
+        return Server
+    if name == "start_server":
+        from .server import start_server
+
+        return start_server
+    if name == "HindsightClient":
+        # Re-export Client from hindsight-client
+        from hindsight_client import Hindsight
+
+        return Hindsight
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")